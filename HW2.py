@@ -1,11 +1,11 @@
+import ctypes
 import math
 import sys
-import pygame
-from pygame.locals import (
-    DOUBLEBUF, OPENGL, QUIT, KEYDOWN, K_ESCAPE, K_UP, K_DOWN
-)
-from OpenGL.GL import *
-from OpenGL.GLU import *
+import numpy as np
+import frameprof
+import geodesic
+import scene_transforms
+from lazyload import load_gl, load_pygame
 
 
 WINDOW_SIZE = (1280, 720)
@@ -25,6 +25,15 @@ TILT_STEP = 2.0
 SPHERE_SLICES = 32
 SPHERE_STACKS = 24
 
+# (slices, stacks) per level of detail, finest first, and the projected
+# radius in pixels a body needs to be drawn at that level.
+SPHERE_LODS = ((SPHERE_SLICES, SPHERE_STACKS), (16, 12), (8, 6))
+SPHERE_LOD_MIN_PX = (12.0, 4.0, 0.0)
+# The same LODs as subdivided icosahedra (1280, 320 and 80 triangles), which
+# spread their triangles evenly instead of bunching them at the poles.
+GEODESIC_LODS = (3, 2, 1)
+SPHERE_MESH = "geodesic"   # or "uv" for gluSphere-style slices and stacks
+
 
 YELLOW = (1.0, 1.0, 0.0)
 BLUE   = (0.2, 0.5, 1.0)
@@ -48,19 +57,87 @@ MOON_ORBIT_RADIUS = 1.5
 MOON_RADIUS = 1.0 * 0.27
 MOON_PERIOD_DAYS = 27.3  
 
-_quadric_cache = None
-def get_quadric():
-    global _quadric_cache
-    if _quadric_cache is None:
-        _quadric_cache = gluNewQuadric()
-        gluQuadricNormals(_quadric_cache, GLU_SMOOTH)
-    return _quadric_cache
-
-def draw_sphere(radius, color, slices=SPHERE_SLICES, stacks=SPHERE_STACKS):
-    glColor3f(*color)
-    gluSphere(get_quadric(), radius, slices, stacks)
+def unit_sphere(slices, stacks):
+    """Positions (which double as normals) and CCW triangle indices, z-axis poles like gluSphere."""
+    phi = np.linspace(0.0, math.pi, stacks + 1)[:, None]
+    theta = np.linspace(0.0, 2.0 * math.pi, slices + 1)[None, :]
+    P = np.stack([np.sin(phi) * np.cos(theta),
+                  np.sin(phi) * np.sin(theta),
+                  np.cos(phi) + 0.0 * theta], axis=-1).reshape(-1, 3)
+    i, j = np.meshgrid(np.arange(stacks), np.arange(slices), indexing="ij")
+    a = (i * (slices + 1) + j).ravel()
+    b, c, d = a + slices + 1, a + 1, a + slices + 2
+    T = np.concatenate([np.stack([a, b, c], 1), np.stack([c, b, d], 1)])
+    return P.astype(np.float32), T.astype(np.uint32)
+
+def lod_meshes():
+    """Unit-sphere (positions, indices) per LOD, finest first, as SPHERE_MESH selects."""
+    if SPHERE_MESH == "geodesic":
+        return [geodesic.sphere_buffers(level) for level in GEODESIC_LODS]
+    return [unit_sphere(slices, stacks) for slices, stacks in SPHERE_LODS]
+
+class SphereLODs:
+    """Every sphere LOD packed into one vertex/index buffer pair, so a frame binds them once."""
+
+    def __init__(self, meshes=None):
+        verts, tris, self.ranges = [], [], []
+        base = offset = 0
+        for P, T in meshes or lod_meshes():
+            verts.append(P)
+            tris.append(T + base)
+            self.ranges.append((offset * 4, T.size))
+            base += len(P)
+            offset += T.size
+        V = np.ascontiguousarray(np.concatenate(verts))
+        I = np.ascontiguousarray(np.concatenate(tris).ravel())
+        self.vbo, self.ibo = glGenBuffers(2)
+        glBindBuffer(GL_ARRAY_BUFFER, self.vbo)
+        glBufferData(GL_ARRAY_BUFFER, V.nbytes, V, GL_STATIC_DRAW)
+        glBindBuffer(GL_ELEMENT_ARRAY_BUFFER, self.ibo)
+        glBufferData(GL_ELEMENT_ARRAY_BUFFER, I.nbytes, I, GL_STATIC_DRAW)
+        glBindBuffer(GL_ARRAY_BUFFER, 0)
+        glBindBuffer(GL_ELEMENT_ARRAY_BUFFER, 0)
+        self.bound = False
+
+    def bind(self):
+        glPushAttrib(GL_ENABLE_BIT)
+        glEnable(GL_RESCALE_NORMAL)
+        glBindBuffer(GL_ARRAY_BUFFER, self.vbo)
+        glBindBuffer(GL_ELEMENT_ARRAY_BUFFER, self.ibo)
+        glEnableClientState(GL_VERTEX_ARRAY)
+        glEnableClientState(GL_NORMAL_ARRAY)
+        glVertexPointer(3, GL_FLOAT, 0, ctypes.c_void_p(0))
+        glNormalPointer(GL_FLOAT, 0, ctypes.c_void_p(0))
+        self.bound = True
+
+    def unbind(self):
+        glDisableClientState(GL_NORMAL_ARRAY)
+        glDisableClientState(GL_VERTEX_ARRAY)
+        glBindBuffer(GL_ARRAY_BUFFER, 0)
+        glBindBuffer(GL_ELEMENT_ARRAY_BUFFER, 0)
+        glPopAttrib()
+        self.bound = False
+
+    def draw(self, lod):
+        offset, count = self.ranges[lod]
+        glDrawElements(GL_TRIANGLES, count, GL_UNSIGNED_INT, ctypes.c_void_p(offset))
+
+def sphere_lod(radius, distance=CAMERA_BACK):
+    px = radius * (WINDOW_SIZE[1] * 0.5) / (math.tan(math.radians(FOV_Y) * 0.5) * distance)
+    for lod, min_px in enumerate(SPHERE_LOD_MIN_PX):
+        if px >= min_px:
+            return lod
+    return len(SPHERE_LOD_MIN_PX) - 1
+
+_sphere_lods = None
+def get_sphere_lods():
+    global _sphere_lods
+    if _sphere_lods is None:
+        _sphere_lods = SphereLODs()
+    return _sphere_lods
 
 def init_gl():
+    load_gl(globals())
     glEnable(GL_DEPTH_TEST)
     glDepthFunc(GL_LEQUAL)
     glEnable(GL_CULL_FACE)
@@ -88,27 +165,162 @@ def set_viewport(w, h):
     glMatrixMode(GL_MODELVIEW)
 
 
-def planet_angle_delta_deg(planet_period_days, earth_deg_per_update=EARTH_DEG_PER_UPDATE):
-    EARTH_PERIOD = 365.26
-    return earth_deg_per_update * (EARTH_PERIOD / planet_period_days)
+ORBIT_SEGMENTS = 200
+ORBIT_COLOR = (0.5, 0.5, 0.6)
+
+_ring_points = {}
+def orbit_ring_points(radius, segments=ORBIT_SEGMENTS):
+    key = (radius, segments)
+    pts = _ring_points.get(key)
+    if pts is None:
+        pts = _ring_points[key] = tuple(
+            (radius * math.cos(2.0 * math.pi * i / segments),
+             radius * math.sin(2.0 * math.pi * i / segments), 0.0)
+            for i in range(segments)
+        )
+    return pts
+
+# (ring keys, display list) for the ring set compiled last; a different set
+# of (radius, segments) keys rebuilds the list.
+_ring_batch = None
+@frameprof.timed("draw_orbit_rings")
+def draw_orbit_rings(radii, segments=ORBIT_SEGMENTS):
+    global _ring_batch
+    keys = tuple((r, segments) for r in radii)
+    if _ring_batch is None or _ring_batch[0] != keys:
+        if _ring_batch is not None:
+            glDeleteLists(_ring_batch[1], 1)
+        lst = glGenLists(1)
+        glNewList(lst, GL_COMPILE)
+        for r, n in keys:
+            glBegin(GL_LINE_LOOP)
+            for p in orbit_ring_points(r, n):
+                glVertex3f(*p)
+            glEnd()
+        glEndList()
+        _ring_batch = (keys, lst)
 
-def draw_orbit_ring(radius, segments=200):
-    glDisable(GL_LIGHTING)
     glPushAttrib(GL_ENABLE_BIT | GL_LINE_BIT | GL_CURRENT_BIT | GL_DEPTH_BUFFER_BIT)
+    glDisable(GL_LIGHTING)
     glDepthMask(GL_FALSE)
-    glColor3f(0.5, 0.5, 0.6)
+    glColor3f(*ORBIT_COLOR)
     glLineWidth(1.0)
-    glBegin(GL_LINE_LOOP)
-    for i in range(segments):
-        theta = (i / float(segments)) * 2.0 * math.pi
-        glVertex3f(radius * math.cos(theta), radius * math.sin(theta), 0.0)
-    glEnd()
-    glDepthMask(GL_TRUE)
+    glCallList(_ring_batch[1])
     glPopAttrib()
-    glEnable(GL_LIGHTING)
+
+
+def angles_at(days):
+    """Closed-form orbit angles (degrees) after `days` simulated days."""
+    angles = {
+        name: (360.0 * days / period_days) % 360.0
+        for (name, _color, _r, _orbit, period_days) in PLANETS
+    }
+    return angles, (360.0 * days / MOON_PERIOD_DAYS) % 360.0
+
+
+SIM_STEP = 1.0 / 60.0
+# At 1x warp Earth moves EARTH_DEG_PER_UPDATE per SIM_STEP, i.e. the old
+# one-update-per-60Hz-frame speed.
+SIM_DAYS_PER_SECOND = EARTH_DEG_PER_UPDATE / SIM_STEP * (365.26 / 360.0)
+WARP_MIN, WARP_MAX = 1.0, 10000.0
+
+class SimClock:
+    """
+    Fixed-timestep simulation time in days, decoupled from the render rate.
+
+    Real frame time accumulates and is consumed in SIM_STEP steps; since
+    orbit angles are closed-form in time, any number of steps (and any warp)
+    is applied as one multiply. render_days() interpolates between the last
+    two steps by the leftover fraction.
+    """
+
+    def __init__(self, step=SIM_STEP, days_per_second=SIM_DAYS_PER_SECOND, warp=1.0, max_frame=0.25):
+        self.step = step
+        self.days_per_second = days_per_second
+        self.max_frame = max_frame
+        self.warp = 1.0
+        self.set_warp(warp)
+        self.days = self.prev_days = 0.0
+        self.acc = 0.0
+
+    def set_warp(self, warp):
+        self.warp = min(WARP_MAX, max(WARP_MIN, warp))
+
+    def advance(self, dt):
+        self.acc += min(max(dt, 0.0), self.max_frame)
+        n = int(self.acc // self.step)
+        if n:
+            step_days = self.step * self.days_per_second * self.warp
+            self.prev_days = self.days + (n - 1) * step_days
+            self.days += n * step_days
+            self.acc -= n * self.step
+
+    def render_days(self):
+        alpha = self.acc / self.step
+        return self.prev_days + (self.days - self.prev_days) * alpha
+
+# name, parent, color, radius, orbit radius; parents must precede children.
+BODIES = (
+    [("Sun", None, YELLOW, SUN_RADIUS, 0.0)]
+    + [(name, "Sun", color, radius, orbit) for (name, color, radius, orbit, _p) in PLANETS]
+    + [("Moon", "Earth", GREY, MOON_RADIUS, MOON_ORBIT_RADIUS)]
+)
+
+_body_table = None
+def body_table():
+    global _body_table
+    if _body_table is None:
+        names = [b[0] for b in BODIES]
+        parents = np.array([-1 if b[1] is None else names.index(b[1]) for b in BODIES])
+        _body_table = {
+            "names": names,
+            "parents": parents,
+            "levels": scene_transforms.hierarchy_levels(parents),
+            "colors": [b[2] for b in BODIES],
+            "radii": np.array([b[3] for b in BODIES]),
+            "orbits": np.array([b[4] for b in BODIES]),
+            "lods": [sphere_lod(b[3]) for b in BODIES],
+        }
+    return _body_table
+
+def body_angles(angles, moon_angle):
+    return np.array([moon_angle if name == "Moon" else angles.get(name, 0.0)
+                     for name in body_table()["names"]])
+
+def body_world_matrices(angles, moon_angle):
+    t = body_table()
+    return scene_transforms.world_matrices(
+        t["parents"], body_angles(angles, moon_angle), t["orbits"], t["levels"])
+
+@frameprof.timed("draw_scene")
+def draw_scene(angles, moon_angle, tilt_deg):
+    glClear(GL_COLOR_BUFFER_BIT | GL_DEPTH_BUFFER_BIT)
+
+    view = scene_transforms.translation(0.0, 0.0, -CAMERA_BACK) @ scene_transforms.rotation_x(tilt_deg)
+    glLoadMatrixf(np.ascontiguousarray(view.T, dtype=np.float32))
+
+    glLightfv(GL_LIGHT0, GL_POSITION, (0.0, 0.0, 1.0, 0.0))
+
+    draw_orbit_rings([orbit_radius for (_n, _c, _r, orbit_radius, _p) in PLANETS])
+
+    t = body_table()
+    world = body_world_matrices(angles, moon_angle)
+    mats = scene_transforms.model_view(view, world, t["radii"])
+
+    spheres = get_sphere_lods()
+    spheres.bind()
+    for m, color, lod in zip(mats, t["colors"], t["lods"]):
+        glLoadMatrixf(m)
+        glColor3f(*color)
+        spheres.draw(lod)
+    spheres.unbind()
+
+    glLoadMatrixf(np.ascontiguousarray(view.T, dtype=np.float32))
+    return scene_transforms.positions(world)
 
 
 def main():
+    load_pygame(globals())
     pygame.init()
     pygame.display.set_caption("COSC 4370 HW2 - Inner Solar System")
     screen = pygame.display.set_mode(WINDOW_SIZE, DOUBLEBUF | OPENGL)
@@ -118,79 +330,41 @@ def main():
     clock = pygame.time.Clock()
 
     tilt_deg = 90.0 
-    angles = {name: 0.0 for (name, *_rest) in PLANETS}
-    moon_angle = 0.0
-
-    
-    planet_speeds = {
-        name: planet_angle_delta_deg(period_days)
-        for (name, _color, _r, _orbit, period_days) in PLANETS
-    }
-    moon_speed = EARTH_DEG_PER_UPDATE * (365.26 / MOON_PERIOD_DAYS)
+    sim = SimClock()
 
     running = True
     while running:
-        for event in pygame.event.get():
-            if event.type == QUIT:
-                running = False
-            elif event.type == KEYDOWN:
-                if event.key == K_ESCAPE:
+        with frameprof.scope("events"):
+            for event in pygame.event.get():
+                if event.type == QUIT:
                     running = False
-                elif event.key == K_UP:
-                    tilt_deg = min(TILT_MAX, tilt_deg + TILT_STEP)
-                elif event.key == K_DOWN:
-                    tilt_deg = max(TILT_MIN, tilt_deg - TILT_STEP)
-
-        for (name, _c, _r, _o, _p) in PLANETS:
-            angles[name] = (angles[name] + planet_speeds[name]) % 360.0
-        moon_angle = (moon_angle + moon_speed) % 360.0
-
-        glClear(GL_COLOR_BUFFER_BIT | GL_DEPTH_BUFFER_BIT)
-        glLoadIdentity()
-
-        glTranslatef(0.0, 0.0, -CAMERA_BACK)
-        glRotatef(tilt_deg, 1.0, 0.0, 0.0)
-
-        glLightfv(GL_LIGHT0, GL_POSITION, (0.0, 0.0, 1.0, 0.0))
-
-        glPushMatrix()
-        draw_sphere(SUN_RADIUS, YELLOW)
-        glPopMatrix()
-
-        for (name, _color, _radius, orbit_radius, _period) in PLANETS:
-            draw_orbit_ring(orbit_radius)
-
-        
-        earth_world_pos = (0.0, 0.0, 0.0)
-
-        for (name, color, radius, orbit_radius, _period) in PLANETS:
-            glPushMatrix()
-
-            glRotatef(angles[name], 0.0, 0.0, 1.0)
-            glTranslatef(orbit_radius, 0.0, 0.0)
-
-            if name == "Earth":
-                m = glGetFloatv(GL_MODELVIEW_MATRIX).T 
-                earth_world_pos = (m[3][0], m[3][1], m[3][2])
-
-            draw_sphere(radius, color)
-            glPopMatrix()
-
-        glPushMatrix()
-        glRotatef(angles["Earth"], 0.0, 0.0, 1.0)
-        glTranslatef(AU_TO_UNITS * 1.0, 0.0, 0.0)
-
-        glRotatef(moon_angle, 0.0, 0.0, 1.0)
-        glTranslatef(MOON_ORBIT_RADIUS, 0.0, 0.0)
-        draw_sphere(MOON_RADIUS, GREY)
-        glPopMatrix()
+                elif event.type == KEYDOWN:
+                    if event.key == K_ESCAPE:
+                        running = False
+                    elif event.key == K_UP:
+                        tilt_deg = min(TILT_MAX, tilt_deg + TILT_STEP)
+                    elif event.key == K_DOWN:
+                        tilt_deg = max(TILT_MIN, tilt_deg - TILT_STEP)
+                    elif event.key == K_RIGHT:
+                        sim.set_warp(sim.warp * 10.0)
+                    elif event.key == K_LEFT:
+                        sim.set_warp(sim.warp / 10.0)
+
+        dt = clock.tick(60) / 1000.0
+        with frameprof.scope("simulate"):
+            sim.advance(dt)
+            angles, moon_angle = angles_at(sim.render_days())
+
+        draw_scene(angles, moon_angle, tilt_deg)
 
         pygame.display.set_caption(
             f"COSC 4370 HW2 - Inner Solar System | Tilt: {tilt_deg:.0f}° (Up/Down)"
+            f" | Warp: {sim.warp:.0f}x (Left/Right)"
         )
 
-        pygame.display.flip()
-        clock.tick(60)
+        with frameprof.scope("flip"):
+            pygame.display.flip()
+        frameprof.frame()
 
     pygame.quit()
     sys.exit()
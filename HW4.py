@@ -1,12 +1,18 @@
+import ctypes
 import math
-import os
-import pygame
-from pygame.locals import *
+import numpy as np
 
-from OpenGL.GL import *
-from OpenGL.GLU import *
+import frameprof
+import geometry
+from dice import (labels_opposite_sum, shape_labels, get_shape,
+                  tetrahedron, cube, octahedron, icosahedron, dodecahedron)
+from lazyload import load_gl, load_pygame
 
-from PIL import Image, ImageDraw, ImageFont
+# GL and pygame names are bound by init_scene/main, PIL and the glyph
+# pipeline on first texture build, so the geometry can be imported alone.
+def ensure_number_png(*args, **kwargs):
+    from glyphs import ensure_number_png
+    return ensure_number_png(*args, **kwargs)
 
 def v_add(a,b): return (a[0]+b[0], a[1]+b[1], a[2]+b[2])
 def v_sub(a,b): return (a[0]-b[0], a[1]-b[1], a[2]-b[2])
@@ -18,162 +24,100 @@ def v_norm(a):
     return (0,0,0) if L==0 else (a[0]/L,a[1]/L,a[2]/L)
 def v_scale(a,s): return (a[0]*s, a[1]*s, a[2]*s)
 
+# Single-face wrappers over the batched versions in geometry.py.
 def face_normal(V,F):
-    a,b,c = V[F[0]], V[F[1]], V[F[2]]
-    return v_norm(v_cross(v_sub(b,a), v_sub(c,a)))
+    return tuple(geometry.face_normals(V,[F])[0].tolist())
 
 def face_center(V,F):
-    c=(0.0,0.0,0.0)
-    for i in F: c=v_add(c,V[i])
-    return v_scale(c, 1.0/len(F))
+    return tuple(geometry.face_centers(V,[F])[0].tolist())
 
 def build_axes(n):
-    n=v_norm(n)
-    up=(0,1,0) if abs(n[1])<0.9 else (1,0,0)
-    u=v_norm(v_cross(up,n))
-    v=v_norm(v_cross(n,u))
-    return u,v,n
-
-def ensure_number_png(n, size=512):
-    """Create num_n.png with transparent background and black digit if missing."""
-    fname = f"num_{n}.png"
-    if os.path.exists(fname): return fname
-
-    img = Image.new("RGBA", (size, size), (0, 0, 0, 0))
-    draw = ImageDraw.Draw(img)
-
-    try:
-        font = ImageFont.truetype("/Library/Fonts/Arial Bold.ttf", int(size * 0.7))
-    except:
-        try:
-            font = ImageFont.truetype("/System/Library/Fonts/Supplemental/Arial Bold.ttf", int(size * 0.7))
-        except:
-            try:
-                font = ImageFont.truetype("DejaVuSans-Bold.ttf", int(size * 0.7))
-            except:
-                font = ImageFont.load_default()
-
-    text = str(n)
-    try:
-        bbox = draw.textbbox((0, 0), text, font=font)
-        w, h = bbox[2] - bbox[0], bbox[3] - bbox[1]
-    except AttributeError:
-        w, h = draw.textsize(text, font=font)
-
-    draw.text(((size - w) / 2, (size - h) / 2), text, fill=(0, 0, 0, 255), font=font)
-    img.save(fname)
-    return fname
+    u,v,n=geometry.tangent_frames(np.asarray([n],dtype=np.float64))
+    return tuple(u[0].tolist()),tuple(v[0].tolist()),tuple(n[0].tolist())
 
-def upload_texture_from_path(path):
-    img=Image.open(path).convert("RGBA")
-    img = img.transpose(Image.FLIP_TOP_BOTTOM)
-    data = img.tobytes("raw","RGBA",0,-1)
+def upload_rgba(data, width, height, max_level=None):
     tex = glGenTextures(1)
     glBindTexture(GL_TEXTURE_2D, tex)
     glTexParameteri(GL_TEXTURE_2D, GL_TEXTURE_MIN_FILTER, GL_LINEAR_MIPMAP_LINEAR)
     glTexParameteri(GL_TEXTURE_2D, GL_TEXTURE_MAG_FILTER, GL_LINEAR)
-    gluBuild2DMipmaps(GL_TEXTURE_2D, GL_RGBA, img.size[0], img.size[1],
+    if max_level is not None:
+        glTexParameteri(GL_TEXTURE_2D, GL_TEXTURE_MAX_LEVEL, max_level)
+    gluBuild2DMipmaps(GL_TEXTURE_2D, GL_RGBA, width, height,
                       GL_RGBA, GL_UNSIGNED_BYTE, data)
     return tex
 
+def upload_texture(img, max_level=None):
+    from PIL import Image
+    img = img.transpose(Image.FLIP_TOP_BOTTOM)
+    data = img.tobytes("raw","RGBA",0,-1)
+    return upload_rgba(data, img.size[0], img.size[1], max_level)
+
+def upload_texture_from_path(path):
+    from PIL import Image
+    return upload_texture(Image.open(path).convert("RGBA"))
+
 _tex_cache = {}
 def get_textures(nfaces):
     if nfaces in _tex_cache: return _tex_cache[nfaces]
-    tex=[]
-    for i in range(1, nfaces+1):
-        fname = ensure_number_png(i)
-        tex.append(upload_texture_from_path(fname))
+    from glyphs import number_buffers
+    bufs = number_buffers(range(1, nfaces+1))
+    tex = [upload_rgba(data, w, h) for (w, h, data) in (bufs[i] for i in range(1, nfaces+1))]
     _tex_cache[nfaces]=tex
     return tex
 
+ATLAS_CELL = 128
+# Labels in the shared atlas: num_1..num_20 covers every face of the five solids.
+ATLAS_LABELS = 20
+
+def _pow2(n):
+    p=1
+    while p<n: p*=2
+    return p
+
+def atlas_layout(nlabels, cell=ATLAS_CELL):
+    """
+    Power-of-two atlas size and per-label (u0, v0, u1, v1) cell rects for
+    labels 1..nlabels. Rects are in upload_texture's convention, where v runs
+    down the source image, so a label maps exactly like its own texture did.
+    """
+    cols=_pow2(math.ceil(math.sqrt(nlabels)))
+    rows=_pow2(math.ceil(nlabels/cols))
+    W,H=cols*cell,rows*cell
+    rects=[]
+    for i in range(nlabels):
+        x,y=(i%cols)*cell,(i//cols)*cell
+        rects.append((x/W, y/H, (x+cell)/W, (y+cell)/H))
+    return (W,H), rects
+
+def atlas_uv(rect, uv):
+    u0,v0,u1,v1=rect
+    return (u0+(u1-u0)*uv[0], v0+(v1-v0)*uv[1])
+
+_atlas_cache = {}
+def get_number_atlas(nlabels=ATLAS_LABELS, cell=ATLAS_CELL):
+    """
+    One mipmapped texture holding num_1..num_nlabels, downsampled to cell x
+    cell. Every solid draws from the default ATLAS_LABELS atlas, indexed by
+    label.
+    """
+    key=(nlabels,cell)
+    if key in _atlas_cache: return _atlas_cache[key]
+    from PIL import Image
+    from glyphs import load_numbers
+    (W,H),rects=atlas_layout(nlabels,cell)
+    atlas=Image.new("RGBA",(W,H),(0,0,0,0))
+    imgs=load_numbers(range(1,nlabels+1),cell=cell)
+    for i,(u0,v0,_u1,_v1) in enumerate(rects):
+        atlas.paste(imgs[i+1],(round(u0*W),round(v0*H)))
+    # Stop mipmapping at one texel per cell so neighbouring glyphs never blend.
+    tex=upload_texture(atlas,max_level=int(math.log2(cell)))
+    _atlas_cache[key]=tex
+    return tex
+
 def pair_faces(V,F):
-    N=[face_normal(V,f) for f in F]
-    n=len(F)
-    used=[False]*n
-    pairs=[-1]*n
-    for i in range(n):
-        if used[i]: continue
-        best=-1; bestv=1e9
-        for j in range(n):
-            if i==j or used[j]: continue
-            d=abs(v_dot(N[i],N[j])+1.0)
-            if d<bestv:
-                bestv=d; best=j
-        if best==-1:
-            pairs[i]=i; used[i]=True
-        else:
-            pairs[i]=best; pairs[best]=i
-            used[i]=used[best]=True
-    return pairs
-
-def labels_opposite_sum(nfaces, pairs):
-    labels=[0]*nfaces
-    low, high = 1, nfaces
-    for i in range(nfaces):
-        if labels[i]!=0: continue
-        j=pairs[i]
-        if j==i:
-            labels[i]=low; low+=1
-        else:
-            labels[i], labels[j] = low, high
-            low+=1; high-=1
-    return labels
-
-def tetrahedron():
-    d=math.sqrt(3)/3
-    V=[(d,d,-d), (-d,-d,-d), (d,-d,d), (-d,d,d)]
-    F=[(0,1,2),(0,1,3),(0,2,3),(1,2,3)]
-    return V,F
-
-def cube():
-    d=math.sqrt(3)/3
-    V=[(d,-d,-d),(d,d,-d),(-d,d,-d),(-d,-d,-d),
-       (d,-d,d),(d,d,d),(-d,-d,d),(-d,d,d)]
-    F=[(0,1,2,3),(4,5,7,6),(0,1,5,4),(2,3,6,7),(1,2,7,5),(0,3,6,4)]
-    return V,F
-
-def octahedron():
-    V=[(1,0,0),(-1,0,0),(0,1,0),(0,-1,0),(0,0,1),(0,0,-1)]
-    F=[(0,2,4),(1,2,4),(1,3,4),(0,3,4),(0,2,5),(0,3,5),(1,3,5),(1,2,5)]
-    return V,F
-
-def icosahedron():
-    t=(1+math.sqrt(5))/2
-    V=[(-1,t,0),(1,t,0),(-1,-t,0),(1,-t,0),(0,-1,t),(0,1,t),
-       (0,-1,-t),(0,1,-t),(t,0,-1),(t,0,1),(-t,0,-1),(-t,0,1)]
-    V=[v_norm(p) for p in V]
-    F=[(0,11,5),(0,5,1),(0,1,7),(0,7,10),(0,10,11),
-       (1,5,9),(5,11,4),(11,10,2),(10,7,6),(7,1,8),
-       (3,9,4),(3,4,2),(3,2,6),(3,6,8),(3,8,9),
-       (4,9,5),(2,4,11),(6,2,10),(8,6,7),(9,8,1)]
-    return V,F
-
-def dodecahedron():
-    iV, iF = icosahedron()
-    dV=[]
-    for f in iF:
-        c=(0,0,0)
-        for vi in f: c=v_add(c, iV[vi])
-        c=v_norm(c)
-        dV.append(c)
-    adj=[[] for _ in range(len(iV))]
-    for fi,f in enumerate(iF):
-        for vi in f: adj[vi].append(fi)
-    dF=[]
-    for vi,faces in enumerate(adj):
-        center=iV[vi]; n=v_norm(center)
-        u,v,_=build_axes(n)
-        with_angles=[]
-        for fi in faces:
-            p=dV[fi]
-            q=v_sub(p, v_scale(n, v_dot(p,n)))
-            x=v_dot(q,u); y=v_dot(q,v)
-            ang=math.atan2(y,x)
-            with_angles.append((ang,fi))
-        with_angles.sort()
-        dF.append(tuple(fi for ang,fi in with_angles))
-    return dV,dF
+    return geometry.pair_faces(V,F)
 
+@frameprof.timed("draw_solid")
 def draw_solid(V,F,color):
     glColor3fv(color)
     for face in F:
@@ -184,6 +128,12 @@ def draw_solid(V,F,color):
             glVertex3fv(V[idx])
         glEnd()
 
+def label_quad(V, face, scale=0.33, lift=0.01):
+    return [tuple(p) for p in geometry.label_quads(V, [face], scale, lift)[0].tolist()]
+
+QUAD_UVS = ((1, 0), (0, 0), (0, 1), (1, 1))
+
+@frameprof.timed("draw_numbers")
 def draw_numbers(V, F, labels, texs, scale=0.33, lift=0.01):
     glEnable(GL_TEXTURE_2D)
     glEnable(GL_BLEND)
@@ -191,31 +141,13 @@ def draw_numbers(V, F, labels, texs, scale=0.33, lift=0.01):
     glDisable(GL_LIGHTING)
 
     for fi, face in enumerate(F):
-        n = face_normal(V, face)
-        c = face_center(V, face)
-
-        to_center = v_norm(c)
-        if v_dot(n, to_center) < 0:
-            n = v_scale(n, -1)
-
-        u, v, _ = build_axes(n)
-        h = scale
-
-        p00 = v_add(c, v_add(v_scale(u, -h), v_scale(v, -h)))
-        p10 = v_add(c, v_add(v_scale(u,  h), v_scale(v, -h)))
-        p11 = v_add(c, v_add(v_scale(u,  h), v_scale(v,  h)))
-        p01 = v_add(c, v_add(v_scale(u, -h), v_scale(v,  h)))
-
-        liftv = v_scale(n, lift)
-        quad = [v_add(p, liftv) for p in (p00, p10, p11, p01)]
+        quad = label_quad(V, face, scale, lift)
 
         glBindTexture(GL_TEXTURE_2D, texs[labels[fi] - 1])
         glColor4f(1, 1, 1, 1)
         glBegin(GL_QUADS)
-        glTexCoord2f(1, 0); glVertex3fv(quad[0])
-        glTexCoord2f(0, 0); glVertex3fv(quad[1])
-        glTexCoord2f(0, 1); glVertex3fv(quad[2])
-        glTexCoord2f(1, 1); glVertex3fv(quad[3])
+        for uv, p in zip(QUAD_UVS, quad):
+            glTexCoord2f(*uv); glVertex3fv(p)
         glEnd()
 
     glEnable(GL_LIGHTING)
@@ -223,19 +155,92 @@ def draw_numbers(V, F, labels, texs, scale=0.33, lift=0.01):
     glDisable(GL_TEXTURE_2D)
 
 
-def get_shape(shape_id):
-    if shape_id==1: return tetrahedron()
-    if shape_id==2: return cube()
-    if shape_id==3: return octahedron()
-    if shape_id==4: return dodecahedron()
-    return icosahedron()
-
-def main():
-    pygame.init()
-    display=(800,800)
-    pygame.display.set_mode(display, DOUBLEBUF|OPENGL)
-    pygame.display.set_caption("COSC 4370 HW4 – Amin Aden")
-
+COLORS=[(0.90,0.35,0.35),(0.35,0.85,0.45),(0.35,0.55,0.95),
+        (0.75,0.55,0.90),(0.95,0.85,0.35)]
+LABEL_SCALE={5:0.28}
+LABEL_LIFT=0.01
+
+class ShapeRecord:
+    """
+    Everything about a solid that does not change between frames: geometry,
+    face normals, labels, decal quads and the baked vertex arrays. GL buffers
+    are created on the first draw, when a context is guaranteed.
+    """
+
+    def __init__(self, shape_id):
+        self.shape_id=shape_id
+        self.V,self.F=get_shape(shape_id)
+        self.normals=geometry.face_normals(self.V,self.F)
+        self.labels=shape_labels(self.V,self.F)
+        scale=LABEL_SCALE.get(shape_id,0.32)
+        self.quads=geometry.label_quads(self.V,self.F,scale,LABEL_LIFT)
+
+        # Solid: fan-triangulated faces as interleaved position+normal.
+        P,counts=geometry.pad_faces(self.F)
+        face=np.repeat(np.arange(len(P)),counts-2)
+        j=np.arange(len(face))-np.repeat(np.cumsum(counts-2)-(counts-2),counts-2)+1
+        corners=np.stack([P[face,0],P[face,j],P[face,j+1]],axis=1).ravel()
+        V=np.asarray(self.V,dtype=np.float32)
+        self.solid=np.hstack([V[corners],np.repeat(self.normals[face],3,axis=0)]).astype(np.float32)
+        # Decals: four position+uv corners per face, uvs pointing at the
+        # face's label cell in the shared number atlas.
+        _size,rects=atlas_layout(ATLAS_LABELS)
+        self.decals=np.array([(*p,*atlas_uv(rects[label-1],uv))
+                              for q,label in zip(self.quads,self.labels)
+                              for uv,p in zip(QUAD_UVS,q)],
+                             dtype=np.float32)
+        self.vbo=None
+
+    def upload(self):
+        self.vbo=glGenBuffers(2)
+        for buf,data in zip(self.vbo,(self.solid,self.decals)):
+            glBindBuffer(GL_ARRAY_BUFFER,buf)
+            glBufferData(GL_ARRAY_BUFFER,data.nbytes,data,GL_STATIC_DRAW)
+        glBindBuffer(GL_ARRAY_BUFFER,0)
+
+    @frameprof.timed("draw_solid")
+    def draw_solid(self,color):
+        if self.vbo is None: self.upload()
+        glColor3fv(color)
+        glBindBuffer(GL_ARRAY_BUFFER,self.vbo[0])
+        glEnableClientState(GL_VERTEX_ARRAY); glEnableClientState(GL_NORMAL_ARRAY)
+        glVertexPointer(3,GL_FLOAT,24,ctypes.c_void_p(0))
+        glNormalPointer(GL_FLOAT,24,ctypes.c_void_p(12))
+        glDrawArrays(GL_TRIANGLES,0,len(self.solid))
+        glDisableClientState(GL_NORMAL_ARRAY); glDisableClientState(GL_VERTEX_ARRAY)
+        glBindBuffer(GL_ARRAY_BUFFER,0)
+
+    @frameprof.timed("draw_numbers")
+    def draw_numbers(self,atlas):
+        if self.vbo is None: self.upload()
+        glEnable(GL_TEXTURE_2D)
+        glEnable(GL_BLEND)
+        glBlendFunc(GL_SRC_ALPHA, GL_ONE_MINUS_SRC_ALPHA)
+        glDisable(GL_LIGHTING)
+        glColor4f(1,1,1,1)
+
+        glBindBuffer(GL_ARRAY_BUFFER,self.vbo[1])
+        glEnableClientState(GL_VERTEX_ARRAY); glEnableClientState(GL_TEXTURE_COORD_ARRAY)
+        glVertexPointer(3,GL_FLOAT,20,ctypes.c_void_p(0))
+        glTexCoordPointer(2,GL_FLOAT,20,ctypes.c_void_p(12))
+        glBindTexture(GL_TEXTURE_2D,atlas)
+        glDrawArrays(GL_QUADS,0,len(self.decals))
+        glDisableClientState(GL_TEXTURE_COORD_ARRAY); glDisableClientState(GL_VERTEX_ARRAY)
+        glBindBuffer(GL_ARRAY_BUFFER,0)
+
+        glEnable(GL_LIGHTING)
+        glDisable(GL_BLEND)
+        glDisable(GL_TEXTURE_2D)
+
+_shape_cache={}
+def get_shape_record(shape_id):
+    rec=_shape_cache.get(shape_id)
+    if rec is None:
+        rec=_shape_cache[shape_id]=ShapeRecord(shape_id)
+    return rec
+
+def init_scene(display):
+    load_gl(globals())
     glEnable(GL_DEPTH_TEST)
     glDisable(GL_CULL_FACE)  
 
@@ -251,44 +256,50 @@ def main():
     glLightfv(GL_LIGHT0, GL_AMBIENT,  [0.25,0.25,0.25,1.0])
     glShadeModel(GL_SMOOTH)
 
-    current=2
-    angle=0.0
-    clock=pygame.time.Clock()
-    colors=[(0.90,0.35,0.35),(0.35,0.85,0.45),(0.35,0.55,0.95),
-            (0.75,0.55,0.90),(0.95,0.85,0.35)]
+@frameprof.timed("render")
+def render(current, angle):
+    glClearColor(0.06,0.06,0.08,1.0)
+    glClear(GL_COLOR_BUFFER_BIT|GL_DEPTH_BUFFER_BIT)
 
-    while True:
-        dt=clock.tick(60)/1000.0
-        for e in pygame.event.get():
-            if e.type==QUIT: pygame.quit(); return
-            if e.type==KEYDOWN:
-                if e.key in (K_ESCAPE,K_RETURN): pygame.quit(); return
-                if e.key in (K_1,K_2,K_3,K_4,K_5): current=e.key-K_0
+    shape=get_shape_record(current)
+    atlas=get_number_atlas()
 
-        glClearColor(0.06,0.06,0.08,1.0)
-        glClear(GL_COLOR_BUFFER_BIT|GL_DEPTH_BUFFER_BIT)
+    glPushMatrix()
+    tilt=18+10*math.cos(math.radians(angle))
+    glRotatef(tilt,1,0,0)
+    glRotatef(angle,0,0,1)
 
-        V,F=get_shape(current)
+    shape.draw_solid(COLORS[current-1])
+    shape.draw_numbers(atlas)
 
-        if len(F)<=6:
-            labels=list(range(1,len(F)+1))
-        else:
-            pairs=pair_faces(V,F)
-            labels=labels_opposite_sum(len(F),pairs)
+    glPopMatrix()
 
-        texs=get_textures(len(F))
+def main():
+    load_pygame(globals())
+    pygame.init()
+    display=(800,800)
+    pygame.display.set_mode(display, DOUBLEBUF|OPENGL)
+    pygame.display.set_caption("COSC 4370 HW4 – Amin Aden")
+    init_scene(display)
 
-        glPushMatrix()
-        tilt=18+10*math.cos(math.radians(angle))
-        glRotatef(tilt,1,0,0)
-        angle=(angle+40*dt)%360
-        glRotatef(angle,0,0,1)
+    current=2
+    angle=0.0
+    clock=pygame.time.Clock()
 
-        draw_solid(V,F,colors[current-1])
-        draw_numbers(V,F,labels,texs,scale=0.32 if current!=5 else 0.28,lift=0.01)
+    while True:
+        dt=clock.tick(60)/1000.0
+        with frameprof.scope("events"):
+            for e in pygame.event.get():
+                if e.type==QUIT: pygame.quit(); return
+                if e.type==KEYDOWN:
+                    if e.key in (K_ESCAPE,K_RETURN): pygame.quit(); return
+                    if e.key in (K_1,K_2,K_3,K_4,K_5): current=e.key-K_0
 
-        glPopMatrix()
-        pygame.display.flip()
+        angle=(angle+40*dt)%360
+        render(current, angle)
+        with frameprof.scope("flip"):
+            pygame.display.flip()
+        frameprof.frame()
 
 if __name__=="__main__":
     main()
@@ -0,0 +1,105 @@
+"""
+Frame time vs. body count for HW2 spheres: per-body gluSphere at HW2's
+finest slices and stacks, the baseline HW2 used to draw, against the
+shared LOD vertex buffer bound once per frame. Renders offscreen.
+
+    python benchmarks/bench_bodies.py --counts 10 100 1000 5000
+"""
+
+import argparse
+import math
+import os
+import random
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+os.environ.setdefault("PYOPENGL_PLATFORM", "egl")
+os.environ.setdefault("EGL_PLATFORM", "surfaceless")
+os.environ.setdefault("PYGAME_HIDE_SUPPORT_PROMPT", "1")
+
+from headless import OffscreenContext
+
+
+def belt(n, seed=1):
+    rng = random.Random(seed)
+    bodies = []
+    for _ in range(n):
+        a = rng.uniform(0.0, 2.0 * math.pi)
+        r = rng.uniform(16.0, 24.0)
+        bodies.append((r * math.cos(a), r * math.sin(a), rng.uniform(-0.5, 0.5),
+                       rng.uniform(0.05, 0.6), (0.6, 0.55, 0.5)))
+    return bodies
+
+
+_quadric = None
+
+
+def frame_glu(HW2, bodies):
+    global _quadric
+    from OpenGL.GL import glColor3f, glPushMatrix, glPopMatrix, glTranslatef
+    from OpenGL.GLU import GLU_SMOOTH, gluNewQuadric, gluQuadricNormals, gluSphere
+    if _quadric is None:
+        _quadric = gluNewQuadric()
+        gluQuadricNormals(_quadric, GLU_SMOOTH)
+    for x, y, z, r, color in bodies:
+        glPushMatrix()
+        glTranslatef(x, y, z)
+        glColor3f(*color)
+        gluSphere(_quadric, r, HW2.SPHERE_SLICES, HW2.SPHERE_STACKS)
+        glPopMatrix()
+
+
+def frame_lod(HW2, bodies):
+    from OpenGL.GL import glColor3f, glPushMatrix, glPopMatrix, glScalef, glTranslatef
+    spheres = HW2.get_sphere_lods()
+    spheres.bind()
+    for x, y, z, r, color in bodies:
+        glPushMatrix()
+        glTranslatef(x, y, z)
+        glScalef(r, r, r)
+        glColor3f(*color)
+        spheres.draw(HW2.sphere_lod(r))
+        glPopMatrix()
+    spheres.unbind()
+
+
+def measure(draw, HW2, bodies, frames):
+    from OpenGL.GL import glClear, glFinish, glLoadIdentity, glTranslatef, glRotatef, \
+        GL_COLOR_BUFFER_BIT, GL_DEPTH_BUFFER_BIT
+    times = []
+    for _ in range(frames):
+        t = time.perf_counter()
+        glClear(GL_COLOR_BUFFER_BIT | GL_DEPTH_BUFFER_BIT)
+        glLoadIdentity()
+        glTranslatef(0.0, 0.0, -HW2.CAMERA_BACK)
+        glRotatef(60.0, 1.0, 0.0, 0.0)
+        draw(HW2, bodies)
+        glFinish()
+        times.append(time.perf_counter() - t)
+    times.sort()
+    return times[len(times) // 2] * 1000.0
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    ap.add_argument("--counts", type=int, nargs="+", default=[10, 100, 1000, 5000])
+    ap.add_argument("--frames", type=int, default=10)
+    args = ap.parse_args()
+
+    OffscreenContext(1280, 720)
+    import HW2
+    HW2.init_gl()
+    HW2.set_viewport(*HW2.WINDOW_SIZE)
+
+    print(f"{'bodies':>7} {'gluSphere ms':>13} {'LOD VBO ms':>11} {'speedup':>8}")
+    for n in args.counts:
+        bodies = belt(n)
+        t_glu = measure(frame_glu, HW2, bodies, args.frames)
+        t_lod = measure(frame_lod, HW2, bodies, args.frames)
+        print(f"{n:>7} {t_glu:13.2f} {t_lod:11.2f} {t_glu / t_lod:7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
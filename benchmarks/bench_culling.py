@@ -0,0 +1,75 @@
+"""
+Meshlet culling on the teapot turntable, offscreen: triangles submitted
+and frame time over a full turn with culling off, in auto mode (frustum
+only on the open teapot.obj) and in full mode (frustum and back-facing
+meshlets), on teapot.obj and subdivided copies.
+
+    python benchmarks/bench_culling.py --levels 0 2 --renderers vbo immediate
+"""
+
+import argparse
+import os
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.join(ROOT, "teapot"))
+os.environ.setdefault("PYOPENGL_PLATFORM", "egl")
+os.environ.setdefault("EGL_PLATFORM", "surfaceless")
+
+import headless
+import teapot
+from bench_normals import subdivide
+
+
+def turn(frames):
+    from OpenGL.GL import glFinish
+    teapot.angle = 0.0
+    teapot.render(); glFinish()
+    tris = 0
+    t = time.perf_counter()
+    for i in range(frames):
+        teapot.angle = i * 360.0 / frames
+        teapot.render()
+        tris += teapot.submitted
+    glFinish()
+    return tris / frames, (time.perf_counter() - t) / frames * 1e3
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    ap.add_argument("--levels", type=int, nargs="+", default=[0, 1, 2])
+    ap.add_argument("--renderers", nargs="+", default=["vbo", "immediate"])
+    ap.add_argument("--immediate-max", type=int, default=30000,
+                    help="skip the immediate renderer above this many triangles")
+    ap.add_argument("--frames", type=int, default=72)
+    ap.add_argument("--obj", default=os.path.join(ROOT, "teapot", "teapot.obj"))
+    args = ap.parse_args()
+
+    headless.OffscreenContext(800, 600)
+    teapot.load_obj(args.obj)
+    V, T = teapot.vertices, teapot.triangles
+    teapot.reshape(800, 600)
+    teapot.init_lighting()
+    teapot.init_material()
+
+    print(f"{'tris':>7} {'renderer':>9} {'cull':>5} {'meshlets':>8} {'submitted':>10} {'ms/frame':>9}")
+    for level in range(max(args.levels) + 1):
+        if level in args.levels:
+            for renderer in args.renderers:
+                if renderer == "immediate" and len(T) > args.immediate_max:
+                    continue
+                for cull in ("off", "auto", "full"):
+                    teapot.vertices, teapot.triangles = V, T
+                    teapot.RENDERER, teapot.CULL = renderer, cull
+                    teapot.compute_normals()
+                    teapot.build_mesh()
+                    tris, ms = turn(args.frames)
+                    n = len(teapot.clusters) if teapot.clusters is not None else 0
+                    print(f"{len(T):>7} {renderer:>9} {cull:>5} {n:>8} {tris:10.0f} {ms:9.2f}")
+        V, T = subdivide(V, T)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,97 @@
+"""
+Wireframe edge extraction on geodesic sphere vertices: the grid-hash
+shortest-edge and k-nearest searches in mesh_edges against a chunked NumPy
+all-pairs reference (what starter's old pair list computed). A second
+table takes edges straight from face lists (teapot.obj and the same
+spheres): starter's old set-of-tuples loop against face_edges, with and
+without edge-to-face adjacency.
+
+    python benchmarks/bench_edges.py --levels 3 5 7
+"""
+
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+os.environ.setdefault("PYGAME_HIDE_SUPPORT_PROMPT", "1")
+
+import mesh_edges
+from geodesic import geodesic_sphere
+
+sys.path.insert(0, os.path.join(ROOT, "teapot"))
+import teapot
+
+
+def all_pairs_shortest(V, tol=1e-5, rows=512):
+    """O(V^2) reference in two passes over row blocks, so memory stays bounded."""
+    def blocks():
+        for s in range(0, len(V), rows):
+            D = np.linalg.norm(V[s:s + rows, None] - V[None], axis=-1)
+            upper = np.arange(len(V))[None] > np.arange(s, s + len(D))[:, None]
+            yield s, np.where(upper, D, np.inf)
+    thr = min(D.min() for _, D in blocks()) * (1.0 + tol)
+    return np.concatenate([np.argwhere(D <= thr) + [s, 0] for s, D in blocks()])
+
+
+def python_face_edges(faces):
+    """starter.unique_edges_from_faces before it was vectorized."""
+    seen = set(); out = []
+    for f in faces:
+        n = len(f)
+        for i in range(n):
+            a,b = f[i], f[(i+1)%n]
+            e = (a,b) if a<b else (b,a)
+            if e not in seen:
+                seen.add(e); out.append(e)
+    return out
+
+
+def timed(fn, *args, **kw):
+    t = time.perf_counter()
+    out = fn(*args, **kw)
+    return out, time.perf_counter() - t
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    ap.add_argument("--levels", type=int, nargs="+", default=[3, 5, 7])
+    ap.add_argument("--brute-max", type=int, default=3000,
+                    help="skip the all-pairs reference above this many vertices")
+    ap.add_argument("-k", type=int, default=6, help="neighbors per vertex for knn_edges")
+    ap.add_argument("--obj", default=os.path.join(ROOT, "teapot", "teapot.obj"))
+    args = ap.parse_args()
+
+    print(f"{'verts':>7} {'all-pairs s':>12} {'shortest s':>11} {'agree':>6} "
+          f"{'knn s':>8} {'knn edges':>10}")
+    meshes = []
+    for level in args.levels:
+        V, F = geodesic_sphere(level)
+        meshes.append((f"sphere{level}", F))
+        E, t_grid = timed(mesh_edges.shortest_edges, V)
+        if len(V) <= args.brute_max:
+            ref, t_ref = timed(all_pairs_shortest, V)
+            brute, agree = f"{t_ref:12.3f}", f"{str(np.array_equal(ref, E)):>6}"
+        else:
+            brute, agree = f"{'-':>12}", f"{'-':>6}"
+        # Geodesic edge lengths vary by ~20%, so the tolerance admits all of them.
+        K, t_knn = timed(mesh_edges.knn_edges, V, args.k, tol=0.3)
+        print(f"{len(V):>7} {brute} {t_grid:11.3f} {agree} {t_knn:8.3f} {len(K):>10}")
+
+    teapot.load_obj(args.obj)
+    meshes.insert(0, ("teapot", teapot.triangles))
+    print(f"\n{'mesh':>8} {'faces':>7} {'edges':>7} {'python s':>9} {'numpy s':>8} "
+          f"{'+adj s':>7} {'agree':>6}")
+    for name, F in meshes:
+        ref, t_py = timed(python_face_edges, F.tolist())
+        E, t_np = timed(mesh_edges.face_edges, F)
+        _, t_adj = timed(mesh_edges.face_edges, F, return_faces=True)
+        agree = [tuple(e) for e in E.tolist()] == ref
+        print(f"{name:>8} {len(F):>7} {len(E):>7} {t_py:9.3f} {t_np:8.4f} {t_adj:7.4f} {str(agree):>6}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,70 @@
+"""
+Geodesic sphere construction: geodesic.geodesic_sphere built cold from the
+icosahedron at each level, against a per-triangle Python loop with a dict
+midpoint cache, plus the cost of a memoized lookup.
+
+    python benchmarks/bench_geodesic.py --levels 3 5 7 8
+"""
+
+import argparse
+import math
+import os
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+import geodesic
+
+
+def python_sphere(level):
+    """Reference: one triangle at a time, splitting edges through a dict cache."""
+    V0, F0 = geodesic._base()
+    V = [tuple(p) for p in V0.tolist()]
+    F = [tuple(f) for f in F0.tolist()]
+    for _ in range(level):
+        cache = {}
+        def mid(a, b):
+            key = (a, b) if a < b else (b, a)
+            if key not in cache:
+                x, y, z = (V[a][k] + V[b][k] for k in range(3))
+                L = math.sqrt(x*x + y*y + z*z)
+                V.append((x/L, y/L, z/L))
+                cache[key] = len(V) - 1
+            return cache[key]
+        out = []
+        for a, b, c in F:
+            ab, bc, ca = mid(a, b), mid(b, c), mid(c, a)
+            out += [(a, ab, ca), (b, bc, ab), (c, ca, bc), (ab, bc, ca)]
+        F = out
+    return V, F
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    ap.add_argument("--levels", type=int, nargs="+", default=[3, 5, 7, 8])
+    ap.add_argument("--python-max", type=int, default=6,
+                    help="skip the Python reference above this level")
+    args = ap.parse_args()
+
+    print(f"{'level':>5} {'verts':>8} {'faces':>8} {'python s':>9} {'numpy s':>8} {'memo us':>8}")
+    for level in args.levels:
+        geodesic._levels.clear()
+        t = time.perf_counter()
+        V, F = geodesic.geodesic_sphere(level)
+        t_np = time.perf_counter() - t
+        t = time.perf_counter()
+        geodesic.geodesic_sphere(level)
+        t_memo = time.perf_counter() - t
+        if level <= args.python_max:
+            t = time.perf_counter()
+            python_sphere(level)
+            py = f"{time.perf_counter() - t:9.3f}"
+        else:
+            py = f"{'-':>9}"
+        print(f"{level:>5} {len(V):>8} {len(F):>8} {py} {t_np:8.3f} {t_memo * 1e6:8.1f}")
+
+
+if __name__ == "__main__":
+    main()
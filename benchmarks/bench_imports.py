@@ -0,0 +1,54 @@
+"""
+Import cost of the scene modules, measured in fresh interpreters with
+python -X importtime. Reports the cumulative time of the module's own
+import entry and which heavy stacks (OpenGL, pygame, PIL) it dragged in.
+
+    python benchmarks/bench_imports.py
+    python benchmarks/bench_imports.py starter geometry dice --repeat 5
+"""
+
+import argparse
+import os
+import re
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+MODULES = {
+    "starter": ROOT, "HW2": ROOT, "HW4": ROOT, "geometry": ROOT, "dice": ROOT,
+    "teapot": os.path.join(ROOT, "teapot"),
+}
+HEAVY = ("OpenGL", "pygame", "PIL")
+_LINE = re.compile(r"import time:\s+(\d+) \|\s+(\d+) \|(\s*)(\S+)")
+
+
+def measure(module, cwd):
+    probe = (f"import sys; import {module}; "
+             f"print(','.join(h for h in {HEAVY!r} if h in sys.modules))")
+    # teapot imports frameprof, objfile and lazyload from the root.
+    env = dict(os.environ, PYGAME_HIDE_SUPPORT_PROMPT="1", PYTHONPATH=ROOT)
+    proc = subprocess.run([sys.executable, "-X", "importtime", "-c", probe], cwd=cwd,
+                          env=env, capture_output=True, text=True, check=True)
+    cumulative = 0
+    for line in proc.stderr.splitlines():
+        m = _LINE.match(line)
+        if m and m.group(4) == module and len(m.group(3)) == 1:
+            cumulative = int(m.group(2))
+    return cumulative / 1000.0, proc.stdout.strip() or "-"
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    ap.add_argument("modules", nargs="*", default=list(MODULES))
+    ap.add_argument("--repeat", type=int, default=3, help="best of N fresh interpreters")
+    args = ap.parse_args()
+
+    print(f"{'module':>10} {'import ms':>10}  heavy stacks loaded")
+    for module in args.modules:
+        runs = [measure(module, MODULES.get(module, ROOT)) for _ in range(args.repeat)]
+        ms, heavy = min(runs)
+        print(f"{module:>10} {ms:10.1f}  {heavy}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,84 @@
+"""
+Teapot LOD chain: quadric simplification time to LOD_RATIOS, reloading
+from the disk cache, and offscreen frame time for each level over a full
+turn, on teapot.obj and subdivided copies. Also prints which level auto
+selection picks at a few window heights.
+
+    python benchmarks/bench_lod.py --levels 0 1 2
+"""
+
+import argparse
+import os
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.join(ROOT, "teapot"))
+os.environ.setdefault("PYOPENGL_PLATFORM", "egl")
+os.environ.setdefault("EGL_PLATFORM", "surfaceless")
+
+import headless
+import teapot
+from bench_normals import subdivide
+from simplify import simplify
+
+
+def turn(frames):
+    from OpenGL.GL import glFinish
+    teapot.angle = 0.0
+    teapot.render(); glFinish()
+    t = time.perf_counter()
+    for i in range(frames):
+        teapot.angle = i * 360.0 / frames
+        teapot.render()
+    glFinish()
+    return (time.perf_counter() - t) / frames * 1e3
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    ap.add_argument("--levels", type=int, nargs="+", default=[0, 1, 2])
+    ap.add_argument("--renderer", choices=("vbo", "arrays", "immediate"), default="vbo")
+    ap.add_argument("--frames", type=int, default=72)
+    ap.add_argument("--heights", type=int, nargs="+", default=[1200, 600, 300, 150])
+    ap.add_argument("--obj", default=os.path.join(ROOT, "teapot", "teapot.obj"))
+    args = ap.parse_args()
+
+    headless.OffscreenContext(800, 600)
+    teapot.load_obj(args.obj, use_cache=False)
+    teapot.load_lods(args.obj)
+    t = time.perf_counter()
+    teapot.load_lods(args.obj)
+    print(f"{os.path.basename(args.obj)}: LODs from the disk cache in {time.perf_counter() - t:.4f} s\n")
+
+    V, T = teapot.vertices, teapot.triangles
+    teapot.reshape(800, 600)
+    teapot.init_lighting()
+    teapot.init_material()
+    teapot.RENDERER = args.renderer
+
+    print(f"{'tris':>7} {'simplify s':>10}  {'ms/frame per level (triangles)':<48} auto level by height")
+    for level in range(max(args.levels) + 1):
+        if level in args.levels:
+            t = time.perf_counter()
+            simplified = simplify(V, T, teapot.LOD_RATIOS)
+            t_simp = time.perf_counter() - t
+            teapot.lods = [(V, T)] + simplified
+            teapot.build_mesh()
+            cells = []
+            for i, lv in enumerate(teapot.levels):
+                teapot.use_lod(i)
+                cells.append(f"{turn(args.frames):.2f} ({len(lv[1])})")
+            picks = []
+            for h in args.heights:
+                teapot.reshape(h * 4 // 3, h)
+                teapot.select_lod()
+                picks.append(f"{h}:{teapot.level}")
+            teapot.reshape(800, 600)
+            print(f"{len(T):>7} {t_simp:10.2f}  {'  '.join(cells):<48} {' '.join(picks)}")
+        V, T = subdivide(V, T)
+
+
+if __name__ == "__main__":
+    main()
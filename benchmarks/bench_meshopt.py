@@ -0,0 +1,92 @@
+"""
+Vertex welding and vertex-cache ordering on teapot.obj and subdivided
+copies: weld time on an unindexed triangle soup of the same mesh, the
+optimize() pass, ACMR in file order and after, index/vertex buffer size
+for the soup and the welded mesh, and offscreen frame time of the smooth
+(indexed) VBO path in each order. The "far" column checks that the soup,
+scaled by FAR and jittered by under half of WELD_EPS, welds back to its
+distinct positions; an epsilon grid that wide overflows an int64 key.
+
+    python benchmarks/bench_meshopt.py --levels 0 1 2
+"""
+
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.join(ROOT, "teapot"))
+os.environ.setdefault("PYOPENGL_PLATFORM", "egl")
+os.environ.setdefault("EGL_PLATFORM", "surfaceless")
+
+import headless
+import meshopt
+import teapot
+from bench_culling import turn
+from bench_normals import subdivide
+
+FAR = 1000.0
+
+
+def timed(fn, *args):
+    t = time.perf_counter()
+    out = fn(*args)
+    return out, time.perf_counter() - t
+
+
+def frame_ms(V, T, frames):
+    teapot.vertices, teapot.triangles = V, T
+    teapot.compute_normals()
+    teapot.build_mesh()
+    return turn(frames)[1]
+
+
+def far_weld_ok(soup, T):
+    rng = np.random.default_rng(0)
+    d = rng.normal(size=soup.shape)
+    d *= meshopt.WELD_EPS * 0.4 / np.linalg.norm(d, axis=1, keepdims=True)
+    W, _ = meshopt.weld(soup.astype(np.float64) * FAR + d, T)
+    return len(W) == len(np.unique(soup, axis=0))
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    ap.add_argument("--levels", type=int, nargs="+", default=[0, 1, 2])
+    ap.add_argument("--frames", type=int, default=72)
+    ap.add_argument("--obj", default=os.path.join(ROOT, "teapot", "teapot.obj"))
+    args = ap.parse_args()
+
+    headless.OffscreenContext(800, 600)
+    teapot.OPTIMIZE = False
+    teapot.load_obj(args.obj, use_cache=False)
+    V, T = teapot.vertices, teapot.triangles
+    teapot.SMOOTH_NORMALS, teapot.RENDERER, teapot.CULL = True, "vbo", "auto"
+    teapot.reshape(800, 600)
+    teapot.init_lighting()
+    teapot.init_material()
+
+    print(f"{'tris':>7} {'soup KB':>8} {'weld s':>7} {'welded KB':>9} {'opt s':>6} "
+          f"{'ACMR file':>9} {'ACMR opt':>8} {'ms file':>8} {'ms opt':>7} {'far':>4}")
+    for level in range(max(args.levels) + 1):
+        if level in args.levels:
+            soup = V[T].reshape(-1, 3)
+            TS = np.arange(len(soup)).reshape(-1, 3)
+            (W, TW), t_weld = timed(meshopt.weld, soup, TS)
+            soup_kb = (soup.nbytes * 2 + len(soup) * 4) / 1024
+            welded_kb = (len(W) * 24 + TW.size * 4) / 1024
+            (V2, T2, report), t_opt = timed(meshopt.optimize, V, T)
+            ms_file = frame_ms(V, T, args.frames)
+            ms_opt = frame_ms(V2, T2, args.frames)
+            a0, a1 = report["acmr"]
+            far = "ok" if far_weld_ok(soup, TS) else "FAIL"
+            print(f"{len(T):>7} {soup_kb:8.0f} {t_weld:7.3f} {welded_kb:9.0f} {t_opt:6.3f} "
+                  f"{a0:9.3f} {a1:8.3f} {ms_file:8.2f} {ms_opt:7.2f} {far:>4}")
+        V, T = subdivide(V, T)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,91 @@
+"""
+Compare the old per-triangle compute_normals loop with the batched
+face_normals/vertex_normals kernels on teapot.obj and on subdivided copies.
+
+    python benchmarks/bench_normals.py --levels 0 2 4
+"""
+
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.join(ROOT, "teapot"))
+
+import teapot
+
+
+def legacy_normals(V, T):
+    out = []
+    for a, b, c in T:
+        v1 = np.array(V[a], dtype=np.float32)
+        v2 = np.array(V[b], dtype=np.float32)
+        v3 = np.array(V[c], dtype=np.float32)
+        n = np.cross(v2 - v1, v3 - v1)
+        ln = float(np.linalg.norm(n))
+        out.append((n / ln) if ln > 1e-12 else np.array([0.0, 1.0, 0.0], dtype=np.float32))
+    return out
+
+
+def subdivide(V, T):
+    """Split every triangle into four, sharing one midpoint per edge."""
+    T = T.astype(np.int64)
+    e = np.concatenate([T[:, [0, 1]], T[:, [1, 2]], T[:, [2, 0]]])
+    e.sort(axis=1)
+    key = e[:, 0] * len(V) + e[:, 1]
+    uniq, inv = np.unique(key, return_inverse=True)
+    a, b = uniq // len(V), uniq % len(V)
+    V2 = np.concatenate([V, (V[a] + V[b]) * 0.5]).astype(np.float32)
+    m = (inv + len(V)).reshape(3, -1).T
+    m01, m12, m20 = m[:, 0], m[:, 1], m[:, 2]
+    T2 = np.concatenate([
+        np.stack([T[:, 0], m01, m20], 1),
+        np.stack([T[:, 1], m12, m01], 1),
+        np.stack([T[:, 2], m20, m12], 1),
+        np.stack([m01, m12, m20], 1),
+    ])
+    return V2, T2.astype(np.uint32)
+
+
+def timed(fn, *args, repeat=3):
+    best = float("inf")
+    for _ in range(repeat):
+        t = time.perf_counter()
+        fn(*args)
+        best = min(best, time.perf_counter() - t)
+    return best
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    ap.add_argument("--obj", default=os.path.join(ROOT, "teapot", "teapot.obj"))
+    ap.add_argument("--levels", type=int, nargs="+", default=[0, 4],
+                    help="subdivision levels to measure (4 gives ~1.6M triangles)")
+    ap.add_argument("--legacy-max", type=int, default=2_000_000,
+                    help="skip the legacy loop above this many triangles")
+    args = ap.parse_args()
+
+    teapot.load_obj(args.obj)
+    V0, T0 = teapot.vertices, teapot.triangles
+
+    print(f"{'level':>5} {'tris':>10} {'legacy s':>10} {'face s':>9} {'smooth s':>9} {'speedup':>8}")
+    for level in sorted(args.levels):
+        V, T = V0, T0
+        for _ in range(level):
+            V, T = subdivide(V, T)
+        t_face = timed(teapot.face_normals, V, T)
+        t_smooth = timed(teapot.vertex_normals, V, T)
+        if len(T) <= args.legacy_max:
+            t_old = timed(legacy_normals, V, T, repeat=1)
+            legacy, speedup = f"{t_old:10.3f}", f"{t_old / t_face:7.0f}x"
+        else:
+            legacy, speedup = f"{'-':>10}", f"{'-':>8}"
+        print(f"{level:>5} {len(T):>10} {legacy} {t_face:9.4f} {t_smooth:9.4f} {speedup}")
+
+
+if __name__ == "__main__":
+    main()
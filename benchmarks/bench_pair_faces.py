@@ -0,0 +1,71 @@
+"""
+Opposite-face pairing on geodesic spheres: the key-table matcher
+(geometry.pair_faces) against the O(F^2) greedy reference, plus jittered
+meshes that send faces without an exact antipode through the local
+assignment fallback: one with a few vertices moved, and one with every
+vertex moved, so that almost no face keeps its exact antipode.
+
+    python benchmarks/bench_pair_faces.py --levels 3 5 6 7
+"""
+
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+os.environ.setdefault("PYGAME_HIDE_SUPPORT_PROMPT", "1")
+
+import geometry
+from geodesic import geodesic_sphere
+
+
+def timed(fn, *args):
+    t = time.perf_counter()
+    out = fn(*args)
+    return out, time.perf_counter() - t
+
+
+def jittered(V, F, pick, rng):
+    """Pairing time with the vertices pick moved off the sphere grid, and the faces left without an exact antipode."""
+    J = V.copy()
+    J[pick] = geometry.normalize(J[pick] + rng.normal(scale=1e-3, size=(len(pick), 3)))
+    pairs, t = timed(geometry.pair_faces, J, F)
+    N, _ = geometry.outward_normals(J, F)
+    exact = np.abs(np.einsum("ij,ij->i", N, N[pairs]) + 1.0) < 1e-8
+    return t, int((~exact).sum())
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    ap.add_argument("--levels", type=int, nargs="+", default=[3, 5, 6])
+    ap.add_argument("--greedy-max", type=int, default=5120,
+                    help="skip the quadratic reference above this many faces")
+    ap.add_argument("--jitter", type=int, default=10,
+                    help="vertices to perturb in the fallback run")
+    args = ap.parse_args()
+
+    print(f"{'faces':>7} {'greedy s':>9} {'indexed s':>10} {'agree':>6} {'jittered s':>11} {'inexact':>9}"
+          f" {'all moved s':>12} {'inexact':>9}")
+    rng = np.random.default_rng(0)
+    for level in args.levels:
+        V, F = geodesic_sphere(level)
+        pairs, t_idx = timed(geometry.pair_faces, V, F)
+        if len(F) <= args.greedy_max:
+            ref, t_ref = timed(geometry.pair_faces_greedy, V, F)
+            greedy, agree = f"{t_ref:9.3f}", f"{str(ref == pairs):>6}"
+        else:
+            greedy, agree = f"{'-':>9}", f"{'-':>6}"
+
+        pick = rng.choice(len(V), size=min(args.jitter, len(V)), replace=False)
+        t_few, few = jittered(V, F, pick, rng)
+        t_all, every = jittered(V, F, np.arange(len(V)), rng)
+        print(f"{len(F):>7} {greedy} {t_idx:10.4f} {agree} {t_few:11.4f} {few:>9}"
+              f" {t_all:12.4f} {every:>9}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,77 @@
+"""
+teapot.render_cpu (the NumPy rasterizer in teapot/softraster.py) over a
+turntable: ms/frame for each worker count and tile size, and agreement
+with the GL frame from an offscreen context: pixels whose coverage
+differs and pixels off by more than one level in any channel.
+
+    python benchmarks/bench_softraster.py --workers 1 2 4 --tiles 32 64 128
+"""
+
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.join(ROOT, "teapot"))
+os.environ.setdefault("PYOPENGL_PLATFORM", "egl")
+os.environ.setdefault("EGL_PLATFORM", "surfaceless")
+
+import headless
+import teapot
+from softraster import SoftRenderer
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    ap.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4])
+    ap.add_argument("--tiles", type=int, nargs="+", default=[32, 64, 128])
+    ap.add_argument("--frames", type=int, default=12)
+    ap.add_argument("--size", type=int, nargs=2, default=[800, 600])
+    ap.add_argument("--smooth", action="store_true")
+    ap.add_argument("--cull", choices=("auto", "full", "off"), default="auto")
+    ap.add_argument("--obj", default=os.path.join(ROOT, "teapot", "teapot.obj"))
+    args = ap.parse_args()
+    w, h = args.size
+    angles = [i * 360.0 / args.frames for i in range(args.frames)]
+
+    ctx = headless.OffscreenContext(w, h)
+    teapot.SMOOTH_NORMALS, teapot.CULL = args.smooth, args.cull
+    teapot.load_obj(args.obj)
+    teapot.compute_normals()
+    teapot.reshape(w, h)
+    teapot.init_lighting()
+    teapot.init_material()
+    teapot.build_mesh()
+    gl = []
+    for a in angles:
+        teapot.angle = a
+        teapot.render()
+        gl.append(ctx.read_rgb())
+    gl = np.array(gl)
+    covered = np.any(gl != 0, axis=-1)
+
+    print(f"{len(teapot.triangles)} triangles, {w}x{h}, {os.cpu_count()} CPUs")
+    print(f"{'workers':>7} {'tile':>5} {'ms/frame':>9} {'coverage px':>12} {'off >1 px':>10}")
+    for workers in args.workers:
+        for tile in args.tiles:
+            with SoftRenderer(w, h, workers=workers, tile=tile) as r:
+                teapot.angle = angles[0]
+                teapot.render_cpu(r)
+                out = []
+                t = time.perf_counter()
+                for a in angles:
+                    teapot.angle = a
+                    out.append(teapot.render_cpu(r))
+                ms = (time.perf_counter() - t) / len(angles) * 1e3
+            out = np.array(out)
+            cov = (np.any(out != 0, axis=-1) != covered).sum() / len(angles)
+            off = (np.abs(out.astype(int) - gl).max(axis=-1) > 1).sum() / len(angles)
+            print(f"{workers:>7} {tile:>5} {ms:9.1f} {cov:12.1f} {off:10.1f}")
+
+
+if __name__ == "__main__":
+    main()
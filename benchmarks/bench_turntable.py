@@ -0,0 +1,78 @@
+"""
+Turntable export: frames per second for synchronous glReadPixels with
+in-line PNG encoding, against turntable.py's PBO ring with an encoder
+pool, and the peak RSS of each at two sequence lengths. The bounded queue
+should keep the pipelined peak the same for both lengths.
+
+    python benchmarks/bench_turntable.py --frames 72 720 --encoders 1 2
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+OBJ = os.path.join(ROOT, "teapot", "teapot.obj")
+
+# Runs in a fresh interpreter so each case gets its own peak RSS.
+SYNC = """
+import os, sys, time
+os.environ.setdefault("PYOPENGL_PLATFORM", "egl")
+os.environ.setdefault("EGL_PLATFORM", "surfaceless")
+sys.path[:0] = [{root!r}, {teapot!r}]
+import headless, teapot, turntable
+from PIL import Image
+ctx = headless.OffscreenContext({w}, {h})
+teapot.LOD = "off"
+teapot.load_obj({obj!r}); teapot.compute_normals(); teapot.reshape({w}, {h})
+teapot.init_lighting(); teapot.init_material(); teapot.build_mesh()
+t = time.perf_counter()
+for i in range({n}):
+    teapot.angle = i * 360.0 / {n}
+    teapot.render()
+    Image.fromarray(ctx.read_rgb()).save(os.path.join({out!r}, f"frame_{{i:04d}}.png"), compress_level={level})
+print({n} / (time.perf_counter() - t), turntable.peak_rss_mb())
+"""
+
+
+def sync(n, args, out):
+    code = SYNC.format(root=ROOT, teapot=os.path.dirname(OBJ), obj=OBJ, w=args.width, h=args.height,
+                       n=n, out=out, level=args.level)
+    fps, rss = subprocess.run([sys.executable, "-c", code], check=True, capture_output=True,
+                              text=True).stdout.split()
+    return float(fps), float(rss)
+
+
+def pipelined(n, encoders, args, out):
+    cmd = [sys.executable, os.path.join(ROOT, "turntable.py"), OBJ, "--frames", str(n),
+           "--out", out, "--width", str(args.width), "--height", str(args.height),
+           "--encoders", str(encoders), "--level", str(args.level)]
+    rec = json.loads(subprocess.run(cmd, check=True, capture_output=True, text=True).stdout)
+    return rec["fps"], rec["peak_rss_mb"]
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    ap.add_argument("--frames", type=int, nargs="+", default=[72, 720])
+    ap.add_argument("--encoders", type=int, nargs="+", default=[1, 2])
+    ap.add_argument("--width", type=int, default=800)
+    ap.add_argument("--height", type=int, default=600)
+    ap.add_argument("--level", type=int, default=6)
+    args = ap.parse_args()
+
+    print(f"{args.width}x{args.height} PNG level {args.level}, {os.cpu_count()} CPUs\n")
+    print(f"{'frames':>6} {'mode':<14} {'fps':>7} {'peak MB':>8}")
+    for n in args.frames:
+        with tempfile.TemporaryDirectory() as out:
+            fps, rss = sync(n, args, out)
+            print(f"{n:>6} {'sync':<14} {fps:7.1f} {rss:8.0f}")
+            for e in args.encoders:
+                fps, rss = pipelined(n, e, args, out)
+                print(f"{n:>6} {f'pbo, {e} enc':<14} {fps:7.1f} {rss:8.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,80 @@
+"""
+Dice solids and face labelling, with no GL, pygame or PIL dependencies.
+
+Opposite faces are paired by geometry.pair_faces and labelled so each pair
+sums to nfaces + 1; solids with six or fewer faces are numbered in order.
+"""
+
+import math
+
+import frameprof
+import geometry
+
+
+def _unit(a):
+    L=math.sqrt(a[0]*a[0]+a[1]*a[1]+a[2]*a[2])
+    return (0,0,0) if L==0 else (a[0]/L,a[1]/L,a[2]/L)
+
+def labels_opposite_sum(nfaces, pairs):
+    labels=[0]*nfaces
+    low, high = 1, nfaces
+    for i in range(nfaces):
+        if labels[i]!=0: continue
+        j=pairs[i]
+        if j==i:
+            labels[i]=low; low+=1
+        else:
+            labels[i], labels[j] = low, high
+            low+=1; high-=1
+    return labels
+
+def tetrahedron():
+    d=math.sqrt(3)/3
+    V=[(d,d,-d), (-d,-d,-d), (d,-d,d), (-d,d,d)]
+    F=[(0,1,2),(0,1,3),(0,2,3),(1,2,3)]
+    return V,F
+
+def cube():
+    d=math.sqrt(3)/3
+    V=[(d,-d,-d),(d,d,-d),(-d,d,-d),(-d,-d,-d),
+       (d,-d,d),(d,d,d),(-d,-d,d),(-d,d,d)]
+    F=[(0,1,2,3),(4,5,7,6),(0,1,5,4),(2,3,6,7),(1,2,7,5),(0,3,6,4)]
+    return V,F
+
+def octahedron():
+    V=[(1,0,0),(-1,0,0),(0,1,0),(0,-1,0),(0,0,1),(0,0,-1)]
+    F=[(0,2,4),(1,2,4),(1,3,4),(0,3,4),(0,2,5),(0,3,5),(1,3,5),(1,2,5)]
+    return V,F
+
+def icosahedron():
+    t=(1+math.sqrt(5))/2
+    V=[(-1,t,0),(1,t,0),(-1,-t,0),(1,-t,0),(0,-1,t),(0,1,t),
+       (0,-1,-t),(0,1,-t),(t,0,-1),(t,0,1),(-t,0,-1),(-t,0,1)]
+    V=[_unit(p) for p in V]
+    F=[(0,11,5),(0,5,1),(0,1,7),(0,7,10),(0,10,11),
+       (1,5,9),(5,11,4),(11,10,2),(10,7,6),(7,1,8),
+       (3,9,4),(3,4,2),(3,2,6),(3,6,8),(3,8,9),
+       (4,9,5),(2,4,11),(6,2,10),(8,6,7),(9,8,1)]
+    return V,F
+
+def dodecahedron():
+    dV,dF=geometry.dual(*icosahedron())
+    return [tuple(p) for p in dV.tolist()],dF
+
+def shape_labels(V,F,pairs=None):
+    """Face labels: in order up to six faces, else opposite pairs (geometry.pair_faces unless given) summing to len(F)+1."""
+    if len(F)<=6:
+        return list(range(1,len(F)+1))
+    if pairs is None:
+        pairs=geometry.pair_faces(V,F)
+    return labels_opposite_sum(len(F),pairs)
+
+@frameprof.timed("get_shape")
+def get_shape(shape_id):
+    if shape_id==1: return tetrahedron()
+    if shape_id==2: return cube()
+    if shape_id==3: return octahedron()
+    if shape_id==4: return dodecahedron()
+    return icosahedron()
+
+SOLIDS={"tetrahedron":1,"cube":2,"octahedron":3,"dodecahedron":4,"icosahedron":5}
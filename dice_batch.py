@@ -0,0 +1,177 @@
+#!/usr/bin/env python3
+"""
+Offline dice labelling for catalogs of polyhedra.
+
+Each input is an OBJ file (polygon faces are kept as-is) or a built-in
+solid written as solid:<name>. Meshes are centered and scaled to unit
+radius, then fanned out over a process pool that computes the
+opposite-face pairing, labels and decal placement for every face. One
+JSON object per mesh is streamed as JSONL in completion order, and the
+throughput goes to stderr. A mesh whose worker dies (killed for memory,
+say) or runs past --timeout gets an error record instead of stalling the
+batch. Nothing here imports pygame or OpenGL.
+
+    python dice_batch.py solid:dodecahedron models/*.obj --out labels.jsonl
+    python dice_batch.py --list catalog.txt --workers 8
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+from multiprocessing import Pool, TimeoutError
+from multiprocessing.sharedctypes import RawArray
+
+import numpy as np
+
+import dice
+import geometry
+import objfile
+
+
+def read_obj_polygons(path):
+    """Vertices and untriangulated faces of an OBJ file, through objfile's tokenizer."""
+    V, ids, counts = objfile.read_polygons(path, np.float64)
+    if not len(V) or not len(counts):
+        raise ValueError("no vertices/faces found")
+    return V, objfile.polygons(ids, counts)
+
+def load_mesh(source):
+    if source.startswith("solid:"):
+        name = source[len("solid:"):]
+        if name not in dice.SOLIDS:
+            raise ValueError(f"unknown solid {name!r}; choose from {', '.join(dice.SOLIDS)}")
+        V, F = dice.get_shape(dice.SOLIDS[name])
+        return np.array(V, dtype=np.float64), F
+    return read_obj_polygons(source)
+
+def unit_radius(V):
+    V = V - V.mean(axis=0)
+    r = np.linalg.norm(V, axis=1).max()
+    return V / r if r > 0 else V
+
+def label_mesh(job):
+    source, scale, lift, digits = job
+    try:
+        V, F = load_mesh(source)
+        V = unit_radius(V)
+        pairs = geometry.pair_faces(V, F)
+        labels = dice.shape_labels(V, F, pairs)
+        N, C = geometry.outward_normals(V, F)
+        quads = geometry.label_quads(V, F, scale, lift)
+        return {
+            "mesh": source,
+            "vertices": len(V),
+            "faces": len(F),
+            "pairs": pairs,
+            "labels": labels,
+            "decals": {
+                "center": np.round(C, digits).tolist(),
+                "normal": np.round(N, digits).tolist(),
+                "quad": np.round(quads, digits).tolist(),
+            },
+        }
+    except Exception as e:
+        return {"mesh": source, "error": f"{type(e).__name__}: {e}"}
+
+_state = None    # per-job 0 = waiting, 1 = running, 2 = finished, shared with a pool's workers
+
+def _init_worker(state):
+    global _state
+    _state = state
+
+def _label_chunk(chunk):
+    out = []
+    for i, job in chunk:
+        _state[i] = 1
+        out.append((i, label_mesh(job)))
+        _state[i] = 2
+    return out
+
+def label_pool(jobs, workers, chunksize=1, timeout=None):
+    """
+    label_mesh over a process pool, yielding records in completion order.
+    If no result arrives for timeout seconds (a worker killed for memory,
+    or stuck), the meshes that were running get error records, the pool
+    is torn down, and every other mesh without a record goes to a fresh
+    pool.
+    """
+    pending = list(enumerate(jobs))
+    while pending:
+        state = RawArray("b", len(jobs))
+        done = set()
+        pool = Pool(min(workers, len(pending)), initializer=_init_worker, initargs=(state,))
+        try:
+            # Chunked by hand: only chunksize=1 gives an iterator whose next() takes a timeout.
+            chunks = [pending[k:k + chunksize] for k in range(0, len(pending), chunksize)]
+            results = pool.imap_unordered(_label_chunk, chunks)
+            for _ in range(len(chunks)):
+                for i, rec in results.next(timeout):
+                    done.add(i)
+                    yield rec
+            pending = []
+        except TimeoutError:
+            pending = [(i, job) for i, job in pending if i not in done]
+            lost = {i for i, _ in pending if state[i] == 1}
+            # Nothing running: the pool itself is stuck, so give up on the rest.
+            if not lost:
+                lost = {i for i, _ in pending}
+            for i, job in pending:
+                if i in lost:
+                    yield {"mesh": job[0], "error": f"no result within {timeout:g} s (worker killed or hung)"}
+            pending = [(i, job) for i, job in pending if i not in lost]
+        finally:
+            pool.terminate()
+            pool.join()
+
+def read_sources(args):
+    sources = list(args.meshes)
+    for path in args.list or []:
+        with open(path) as f:
+            sources.extend(s.strip() for s in f if s.strip() and not s.startswith("#"))
+    return sources
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="Label dice faces for many meshes and stream JSONL.")
+    ap.add_argument("meshes", nargs="*", help="OBJ paths or solid:<name>")
+    ap.add_argument("--list", action="append", help="file with one mesh source per line")
+    ap.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    ap.add_argument("--chunksize", type=int, default=4)
+    ap.add_argument("--timeout", type=float, default=600.0,
+                    help="seconds without any result before the running meshes count as failed")
+    ap.add_argument("--decal-scale", type=float, default=0.32, help="decal half-size at unit radius")
+    ap.add_argument("--lift", type=float, default=0.01)
+    ap.add_argument("--digits", type=int, default=6, help="decimal places in decal coordinates")
+    ap.add_argument("--out", help="write JSONL here instead of stdout")
+    args = ap.parse_args(argv)
+
+    sources = read_sources(args)
+    if not sources:
+        ap.error("no meshes given")
+    jobs = [(s, args.decal_scale, args.lift, args.digits) for s in sources]
+
+    out = open(args.out, "w") if args.out else sys.stdout
+    start = time.perf_counter()
+    done = failed = faces = 0
+    try:
+        if args.workers > 1:
+            for rec in label_pool(jobs, args.workers, args.chunksize, args.timeout):
+                out.write(json.dumps(rec, separators=(",", ":")) + "\n")
+                done += 1; failed += "error" in rec; faces += rec.get("faces", 0)
+        else:
+            for rec in map(label_mesh, jobs):
+                out.write(json.dumps(rec, separators=(",", ":")) + "\n")
+                done += 1; failed += "error" in rec; faces += rec.get("faces", 0)
+    finally:
+        if out is not sys.stdout:
+            out.close()
+    elapsed = time.perf_counter() - start
+    rate = done / elapsed if elapsed > 0 else float("inf")
+    print(f"{done} meshes ({failed} failed, {faces} faces) in {elapsed:.2f} s: "
+          f"{rate:.1f} meshes/s with {args.workers} workers", file=sys.stderr)
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,240 @@
+"""
+Opt-in frame profiling for the scene scripts. It provides nested stage
+timers, GL call and state-change counts per frame, a Chrome trace and a
+rolling summary.
+
+Profiling is on when FRAME_PROFILE names a trace file at import time, or
+after enable(path). Only that process writes the trace; child processes,
+forked or spawned, never do. enable() has to run before the scripts are
+imported, because timed() decides when a function is defined whether to
+wrap it.
+When profiling is off:
+- timed() hands back the function itself.
+- scope() returns one shared no-op context.
+- frame() and wrap_gl() return at once.
+So the code that runs is the same code as without this module.
+
+When profiling is on:
+- wrap_gl() swaps the gl*/glu*/glut* callables that a star import put in
+  a module's namespace for counting wrappers.
+- Each frame() call closes a frame. It records a "frame" event and a GL
+  counter sample. Every SUMMARY_EVERY frames it prints a summary of
+  per-stage times and GL traffic.
+- Events stream to the trace in the Chrome trace_event array format,
+  which chrome://tracing and ui.perfetto.dev open. The format's closing
+  bracket is optional, so a run that exits without unwinding Python
+  (GLUT's window close) still loads.
+
+    FRAME_PROFILE=hw2.json python HW2.py
+    python headless.py hw4 --frames 300 --profile hw4.json
+"""
+
+import atexit
+import contextlib
+import functools
+import json
+import os
+import sys
+import threading
+import time
+from collections import Counter, defaultdict
+
+ENV = "FRAME_PROFILE"
+OWNER_ENV = "FRAME_PROFILE_PID"   # the process writing the trace, inherited by its children
+SUMMARY_EVERY = 120        # frames per summary line, and per trace flush
+TOP_CALLS = 5
+# Calls that change fixed-function or binding state; they are counted
+# again, on top of the total.
+STATE_CALLS = frozenset((
+    "glEnable", "glDisable", "glEnableClientState", "glDisableClientState",
+    "glBindBuffer", "glBindTexture", "glUseProgram", "glBlendFunc", "glDepthMask",
+    "glShadeModel", "glCullFace", "glFrontFace", "glPolygonMode", "glLineWidth",
+    "glPointSize", "glLightf", "glLightfv", "glMaterialf", "glMaterialfv",
+    "glColorMaterial", "glPushAttrib", "glPopAttrib", "glMatrixMode", "glViewport",
+    "glClearColor", "glPixelStorei", "glTexParameteri", "glVertexPointer",
+    "glNormalPointer", "glTexCoordPointer", "glColorPointer",
+))
+
+_profiler = None
+_NULL = contextlib.nullcontext()
+
+
+class Profiler:
+    """Stage timings, GL counts and the streamed trace for one process."""
+
+    def __init__(self, path, stream=None, summary_every=SUMMARY_EVERY):
+        self.stream = stream or sys.stdout
+        self.summary_every = summary_every
+        self.pid = os.getpid()
+        self.tid = threading.get_ident()
+        self.t0 = self.frame_start = time.perf_counter_ns()
+        self.file = open(path, "w")
+        self.file.write("[\n")
+        self.pending = [{"name": "process_name", "ph": "M", "pid": self.pid,
+                         "args": {"name": os.path.basename(sys.argv[0]) or "python"}}]
+        self.depth = 0
+        self.depth_of = {}           # stage -> nesting depth, in order of first entry
+        self.calls = Counter()       # GL calls in the current frame
+        self.state = 0
+        self.frames = 0
+        self._reset_window()
+
+    def _reset_window(self):
+        self.win_frames = self.win_ns = self.win_state = 0
+        self.win_stage = defaultdict(lambda: [0, 0])   # stage -> [ns, calls]
+        self.win_calls = Counter()
+
+    def _us(self, ns):
+        return (ns - self.t0) / 1000.0
+
+    def stage(self, name, start, end):
+        self.pending.append({"name": name, "cat": "stage", "ph": "X", "ts": self._us(start),
+                             "dur": (end - start) / 1000.0, "pid": self.pid,
+                             "tid": threading.get_ident()})
+        s = self.win_stage[name]
+        s[0] += end - start
+        s[1] += 1
+
+    def frame(self):
+        now = time.perf_counter_ns()
+        self.pending.append({"name": "frame", "cat": "frame", "ph": "X",
+                             "ts": self._us(self.frame_start), "dur": (now - self.frame_start) / 1000.0,
+                             "pid": self.pid, "tid": self.tid, "args": {"index": self.frames}})
+        self.pending.append({"name": "gl", "ph": "C", "ts": self._us(now), "pid": self.pid,
+                             "args": {"calls": sum(self.calls.values()), "state_changes": self.state}})
+        self.win_calls.update(self.calls)
+        self.win_state += self.state
+        self.calls.clear()
+        self.state = 0
+        self.win_ns += now - self.frame_start
+        self.win_frames += 1
+        self.frames += 1
+        self.frame_start = now
+        if self.win_frames >= self.summary_every:
+            self.summary()
+            self.flush()
+            self._reset_window()
+
+    def summary(self):
+        n = self.win_frames
+        if not n:
+            return
+        calls = sum(self.win_calls.values())
+        lines = [f"frameprof: frames {self.frames - n}-{self.frames - 1}: {self.win_ns / n / 1e6:.2f} ms/frame, "
+                 f"{calls / n:.0f} GL calls ({self.win_state / n:.0f} state changes) per frame"]
+        for name, depth in self.depth_of.items():
+            s = self.win_stage.get(name)
+            if s:
+                lines.append(f"  {'  ' * depth}{name:<{28 - 2 * depth}} {s[0] / n / 1e6:8.3f} ms"
+                             f"  {s[1] / n:6.2f} calls")
+        if self.win_calls:
+            top = ", ".join(f"{k} {v / n:.0f}" for k, v in self.win_calls.most_common(TOP_CALLS))
+            lines.append(f"  per frame: {top}")
+        print("\n".join(lines), file=self.stream, flush=True)
+
+    def flush(self):
+        # A forked child inherits the profiler; only the process that opened the trace writes to it.
+        if os.getpid() != self.pid or self.file.closed:
+            return
+        self.file.writelines(json.dumps(e) + ",\n" for e in self.pending)
+        self.pending.clear()
+        self.file.flush()
+
+    def close(self):
+        if os.getpid() != self.pid or self.file.closed:
+            return
+        if self.win_frames:
+            self.summary()
+        self.flush()
+        self.file.write(json.dumps({"name": "thread_name", "ph": "M", "pid": self.pid,
+                                    "tid": self.tid, "args": {"name": "main"}}) + "\n]\n")
+        self.file.close()
+
+
+class _Scope:
+    __slots__ = ("prof", "name", "start")
+
+    def __init__(self, prof, name):
+        self.prof, self.name = prof, name
+
+    def __enter__(self):
+        p = self.prof
+        p.depth_of.setdefault(self.name, p.depth)
+        p.depth += 1
+        self.start = time.perf_counter_ns()
+        return self
+
+    def __exit__(self, *exc):
+        end = time.perf_counter_ns()
+        self.prof.depth -= 1
+        self.prof.stage(self.name, self.start, end)
+        return False
+
+
+def enable(path, stream=None, summary_every=SUMMARY_EVERY):
+    """Start profiling into the trace file at path; summaries go to stream (stdout)."""
+    global _profiler
+    if _profiler is None:
+        _profiler = Profiler(path, stream, summary_every)
+        os.environ[OWNER_ENV] = str(os.getpid())
+        atexit.register(_profiler.close)
+    return _profiler
+
+def enabled():
+    return _profiler is not None
+
+def scope(name):
+    """Context manager timing the block as stage `name`."""
+    p = _profiler
+    return _NULL if p is None else _Scope(p, name)
+
+def timed(name=None):
+    """Decorator timing each call as stage `name` (default: the qualified name)."""
+    def wrap(fn):
+        p = _profiler
+        if p is None:
+            return fn
+        label = name or fn.__qualname__
+        @functools.wraps(fn)
+        def timed_fn(*args, **kwargs):
+            with _Scope(p, label):
+                return fn(*args, **kwargs)
+        return timed_fn
+    return wrap
+
+def frame():
+    """Mark the end of a frame."""
+    if _profiler is not None:
+        _profiler.frame()
+
+def _counting(p, name, fn):
+    calls = p.calls
+    if name in STATE_CALLS:
+        def gl(*args, **kwargs):
+            calls[name] += 1
+            p.state += 1
+            return fn(*args, **kwargs)
+    else:
+        def gl(*args, **kwargs):
+            calls[name] += 1
+            return fn(*args, **kwargs)
+    gl.__name__ = gl.__qualname__ = name
+    gl.__wrapped__ = fn
+    gl._frameprof = True
+    return gl
+
+def wrap_gl(namespace):
+    """Replace the GL/GLU/GLUT functions in a module namespace with counting wrappers."""
+    p = _profiler
+    if p is None:
+        return
+    for k, v in list(namespace.items()):
+        if k.startswith("gl") and callable(v) and not getattr(v, "_frameprof", False):
+            namespace[k] = _counting(p, k, v)
+
+
+# Child processes inherit FRAME_PROFILE too. Under the spawn start method
+# they re-import this module; only the process that started the trace
+# may open it, or the child would truncate the parent's trace file.
+if os.environ.get(ENV) and os.environ.get(OWNER_ENV, str(os.getpid())) == str(os.getpid()):
+    enable(os.environ[ENV])
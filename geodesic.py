@@ -0,0 +1,67 @@
+"""
+Geodesic spheres from repeated 4-way subdivision of the icosahedron.
+
+Each level splits every edge of the previous one exactly once: the faces'
+edges are deduplicated on packed (a, b) keys, which acts as the midpoint
+cache for the whole level, and each midpoint is pushed out to the unit
+sphere. New vertices are appended, so a level's vertices are a prefix of
+the next level's. Levels are built on demand from the deepest one already
+built and memoized, as are their float32/uint32 buffers for drawing.
+"""
+
+import numpy as np
+
+import geometry
+from dice import icosahedron
+
+_levels = []
+_buffers = {}
+
+
+def _base():
+    V, F = icosahedron()
+    V = np.asarray(V, dtype=np.float64)
+    F = np.asarray(F, dtype=np.int64)
+    # Wind every face counter-clockwise seen from outside, for back-face culling.
+    inward = np.einsum("ij,ij->i", geometry.face_normals(V, F), geometry.face_centers(V, F)) < 0
+    F[inward] = F[inward][:, ::-1]
+    return V, F
+
+def subdivide(V, F):
+    """
+    One level: every triangle becomes four, with shared edges split once and
+    midpoints projected onto the unit sphere. Winding is preserved, and each
+    parent's children stay adjacent in F.
+    """
+    n = len(V)
+    E = np.concatenate([F[:, [0, 1]], F[:, [1, 2]], F[:, [2, 0]]])
+    E.sort(axis=1)
+    keys, inv = np.unique(E[:, 0] * n + E[:, 1], return_inverse=True)
+    mid = geometry.normalize(V[keys // n] + V[keys % n])
+    ab, bc, ca = (inv.ravel() + n).reshape(3, -1)
+    a, b, c = F.T
+    F = np.stack([np.stack([a, ab, ca], 1), np.stack([b, bc, ab], 1),
+                  np.stack([c, ca, bc], 1), np.stack([ab, bc, ca], 1)], axis=1)
+    return np.concatenate([V, mid]), F.reshape(-1, 3)
+
+def geodesic_sphere(level):
+    """Unit-sphere vertices (float64) and CCW triangles (int64) after `level` subdivisions: 20 * 4**level faces."""
+    if level < 0:
+        raise ValueError("level must be >= 0")
+    while len(_levels) <= level:
+        V, F = subdivide(*_levels[-1]) if _levels else _base()
+        # Every level is shared by later builds and callers: read-only.
+        V.flags.writeable = F.flags.writeable = False
+        _levels.append((V, F))
+    return _levels[level]
+
+def sphere_buffers(level):
+    """
+    Contiguous float32 positions (which double as normals) and a flat uint32
+    index array for glDrawElements(GL_TRIANGLES).
+    """
+    if level not in _buffers:
+        V, F = geodesic_sphere(level)
+        _buffers[level] = (np.ascontiguousarray(V, dtype=np.float32),
+                           np.ascontiguousarray(F, dtype=np.uint32).ravel())
+    return _buffers[level]
@@ -0,0 +1,323 @@
+"""
+Batched polyhedron geometry on NumPy arrays.
+
+Faces may be ragged (any mix of polygon sizes); they are padded into an
+(F, K) index array plus per-face counts. Normals, centers, tangent frames,
+label quads, opposite-face pairing and the dual construction all work on
+whole face sets at once, so they scale to polyhedra with thousands of
+faces. HW4's tuple helpers are thin wrappers over these.
+"""
+
+import numpy as np
+
+import frameprof
+
+
+def pad_faces(F):
+    """(F, K) int array of face indices, padded by repeating each face's last index, and counts."""
+    if isinstance(F, np.ndarray) and F.ndim == 2:
+        return F.astype(np.intp, copy=False), np.full(len(F), F.shape[1], dtype=np.intp)
+    counts = np.fromiter((len(f) for f in F), dtype=np.intp, count=len(F))
+    K = int(counts.max()) if len(counts) else 0
+    P = np.empty((len(F), K), dtype=np.intp)
+    for k in np.unique(counts):
+        rows = np.flatnonzero(counts == k)
+        P[rows, :k] = [F[r] for r in rows]
+        P[rows, k:] = P[rows, k - 1:k]
+    return P, counts
+
+def normalize(a):
+    """Unit vectors along the last axis; zero vectors stay zero."""
+    a = np.asarray(a, dtype=np.float64)
+    L = np.linalg.norm(a, axis=-1, keepdims=True)
+    return np.divide(a, L, out=np.zeros_like(a), where=L != 0)
+
+def face_normals(V, F):
+    """Normals from each face's first three corners (the winding HW4 uses)."""
+    V = np.asarray(V, dtype=np.float64)
+    P, _ = pad_faces(F)
+    a = V[P[:, 0]]
+    return normalize(np.cross(V[P[:, 1]] - a, V[P[:, 2]] - a))
+
+def face_centers(V, F):
+    V = np.asarray(V, dtype=np.float64)
+    P, counts = pad_faces(F)
+    mask = np.arange(P.shape[1])[None, :] < counts[:, None]
+    return (V[P] * mask[..., None]).sum(axis=1) / counts[:, None]
+
+def tangent_frames(N):
+    """(u, v, n) per normal, matching HW4.build_axes: up is +Y unless n is near it, then +X."""
+    n = normalize(N)
+    up = np.zeros_like(n)
+    near_y = np.abs(n[:, 1]) >= 0.9
+    up[~near_y, 1] = 1.0
+    up[near_y, 0] = 1.0
+    u = normalize(np.cross(up, n))
+    v = normalize(np.cross(n, u))
+    return u, v, n
+
+def outward_normals(V, F):
+    """Face normals flipped, where needed, to point away from the origin."""
+    N = face_normals(V, F)
+    C = face_centers(V, F)
+    flip = np.einsum("ij,ij->i", N, normalize(C)) < 0
+    N[flip] *= -1.0
+    return N, C
+
+def label_quads(V, F, scale=0.33, lift=0.01):
+    """(F, 4, 3) decal corners per face: p00, p10, p11, p01, lifted off the face."""
+    N, C = outward_normals(V, F)
+    u, v, _ = tangent_frames(N)
+    su = np.array([-1.0, 1.0, 1.0, -1.0])[None, :, None] * scale
+    sv = np.array([-1.0, -1.0, 1.0, 1.0])[None, :, None] * scale
+    return C[:, None, :] + su * u[:, None, :] + sv * v[:, None, :] + (N * lift)[:, None, :]
+
+def _greedy_pairs(N):
+    n = len(N)
+    D = np.abs(N @ N.T + 1.0)
+    np.fill_diagonal(D, np.inf)
+    used = np.zeros(n, dtype=bool)
+    pairs = np.arange(n)
+    for i in range(n):
+        if used[i]: continue
+        used[i] = True
+        row = np.where(used, np.inf, D[i])
+        j = int(np.argmin(row))
+        if np.isfinite(row[j]):
+            pairs[i], pairs[j] = j, i
+            used[j] = True
+    return pairs
+
+def pair_faces_greedy(V, F):
+    """
+    Greedy opposite-face pairing, identical to HW4's original loop: in face
+    order, each unpaired face takes the unpaired face whose normal is
+    closest to its negation. O(F^2); kept as the reference.
+    """
+    return _greedy_pairs(face_normals(V, F)).tolist()
+
+def linear_assignment(C):
+    """
+    Minimum-cost assignment for a square cost matrix (Hungarian method,
+    O(n^3) with a vectorized inner loop). Returns col[i] for every row i.
+    """
+    C = np.asarray(C, dtype=np.float64)
+    n = C.shape[0]
+    u = np.zeros(n + 1); v = np.zeros(n + 1)
+    p = np.zeros(n + 1, dtype=np.intp); way = np.zeros(n + 1, dtype=np.intp)
+    for i in range(1, n + 1):
+        p[0] = i; j0 = 0
+        minv = np.full(n + 1, np.inf)
+        used = np.zeros(n + 1, dtype=bool)
+        while True:
+            used[j0] = True
+            i0 = p[j0]
+            free = ~used[1:]
+            cur = C[i0 - 1] - u[i0] - v[1:]
+            better = free & (cur < minv[1:])
+            minv[1:][better] = cur[better]
+            way[1:][better] = j0
+            cand = np.where(free, minv[1:], np.inf)
+            j1 = int(np.argmin(cand)) + 1
+            delta = cand[j1 - 1]
+            u[p[used]] += delta
+            v[used] -= delta
+            minv[1:][free] -= delta
+            j0 = j1
+            if p[j0] == 0: break
+        while j0:
+            j1 = way[j0]; p[j0] = p[j1]; j0 = j1
+    col = np.empty(n, dtype=np.intp)
+    col[p[1:] - 1] = np.arange(n)
+    return col
+
+def _split_cycle(cyc, D):
+    """Cheaper of the two alternating pairings of an assignment cycle."""
+    L = len(cyc)
+    a = [(cyc[k], cyc[k + 1]) for k in range(0, L - 1, 2)]
+    b = [(cyc[k], cyc[(k + 1) % L]) for k in range(1, L - (L % 2), 2)]
+    return min(a, b, key=lambda ps: sum(D[x, y] for x, y in ps))
+
+def _pair_by_assignment(N, idx, pairs):
+    """
+    Pair the faces idx among themselves from an optimal assignment on
+    |Ni.Nj + 1|. 2-cycles are taken as pairs, longer cycles are split into
+    their cheaper alternating set of pairs, and faces left over from odd
+    cycles pair greedily.
+    """
+    if len(idx) < 2:
+        pairs[idx] = idx
+        return
+    D = np.abs(N[idx] @ N[idx].T + 1.0)
+    np.fill_diagonal(D, D.max() + 1e6)
+    col = linear_assignment(D)
+    seen = np.zeros(len(idx), dtype=bool)
+    rest = []
+    for start in range(len(idx)):
+        if seen[start]: continue
+        cyc = [start]; seen[start] = True
+        j = col[start]
+        while j != start:
+            cyc.append(j); seen[j] = True; j = col[j]
+        done = set()
+        for x, y in _split_cycle(cyc, D):
+            pairs[idx[x]], pairs[idx[y]] = idx[y], idx[x]
+            done.update((x, y))
+        rest.extend(c for c in cyc if c not in done)
+    if rest:
+        rest = idx[np.asarray(rest, dtype=np.intp)]
+        pairs[rest] = rest[_greedy_pairs(N[rest])]
+
+# Largest group of faces _pair_local hands to the O(n^3) assignment.
+GROUP_MAX = 32
+
+_CELL_STEPS = np.array([(dx, dy, dz) for dx in (-1, 0, 1) for dy in (-1, 0, 1) for dz in (-1, 0, 1)])
+
+def _nearest_antipodes(N, cell):
+    """
+    For each normal, the other normal closest to its negation among those in
+    the 27 grid cells around -N[i] (-1 if those are empty), and each
+    normal's cell key. Cells are looked up in the sorted key table, so the
+    cost is O(n log n) plus the candidates found.
+    """
+    n = len(N)
+    R = int(np.ceil(1.0 / cell)) + 2
+    B = 2 * R + 1
+
+    def keys(q):
+        q = q + R
+        return (q[..., 0] * B + q[..., 1]) * B + q[..., 2]
+
+    k = keys(np.floor(N / cell).astype(np.int64))
+    order = np.argsort(k, kind="stable")
+    ks = k[order]
+    kt = keys(np.floor(-N / cell).astype(np.int64)[:, None, :] + _CELL_STEPS).ravel()
+    lo = np.searchsorted(ks, kt, side="left")
+    cnt = np.searchsorted(ks, kt, side="right") - lo
+    i = np.repeat(np.arange(len(kt)) // len(_CELL_STEPS), cnt)
+    j = order[np.repeat(lo - np.cumsum(cnt) + cnt, cnt) + np.arange(cnt.sum())]
+    other = i != j
+    i, j = i[other], j[other]
+    cost = np.abs(np.einsum("ij,ij->i", N[i], N[j]) + 1.0)
+    s = np.lexsort((j, cost, i))
+    i, j = i[s], j[s]
+    head = np.flatnonzero(np.r_[True, i[1:] != i[:-1]]) if len(i) else np.zeros(0, dtype=np.intp)
+    best = np.full(n, -1, dtype=np.intp)
+    best[i[head]] = j[head]
+    return best, k
+
+def _components(n, I, J):
+    """Connected-component label (smallest member) per node, by min-label propagation."""
+    label = np.arange(n)
+    while len(I):
+        old = label.copy()
+        np.minimum.at(label, I, label[J])
+        np.minimum.at(label, J, label[I])
+        label = label[label]
+        if np.array_equal(label, old):
+            break
+    return label
+
+def _pair_local(N, idx, pairs):
+    """
+    Pair the faces idx, which have no exact antipode, among themselves. Each
+    round finds every face's nearest candidate to -N in grid cells of about
+    the mean normal spacing. Mutual nearest candidates pair at once; the
+    other faces are grouped along their nearest-candidate links and paired
+    by optimal assignment within groups of at most GROUP_MAX. Faces left
+    over go to the next round, on a coarser grid when a round pairs none.
+    """
+    cell = max(np.sqrt(4.0 * np.pi / max(len(idx), 1)), 1e-6)
+    while len(idx) >= 2:
+        m = len(idx)
+        best, key = _nearest_antipodes(N[idx], cell)
+        has = best >= 0
+        target = np.maximum(best, 0)
+        mutual = has & (best[target] == np.arange(m))
+        pairs[idx[mutual]] = idx[best[mutual]]
+
+        linked = np.flatnonzero(has & ~mutual & ~mutual[target])
+        label = _components(m, linked, best[linked])
+        nodes = np.unique(np.concatenate([linked, best[linked]]))
+        nodes = nodes[np.lexsort((key[nodes], label[nodes]))]
+        cuts = np.flatnonzero(np.diff(label[nodes])) + 1
+        for group in np.split(nodes, cuts):
+            for s in range(0, len(group) - 1, GROUP_MAX):
+                chunk = group[s:s + GROUP_MAX]
+                if len(chunk) >= 2:
+                    _pair_by_assignment(N, idx[chunk], pairs)
+
+        left = (pairs[idx] < 0) | (pairs[idx] == idx)
+        if left.all():
+            cell *= 2.0
+        idx = idx[left]
+        pairs[idx] = -1
+    pairs[idx] = idx
+
+@frameprof.timed("pair_faces")
+def pair_faces(V, F, tol=1e-5):
+    """
+    Opposite-face pairing in O(F log F). Normals are snapped to a tol grid
+    and packed into integer keys; each face looks up the key of -N in the
+    sorted key table, and faces sharing a normal pair off rank by rank with
+    the faces sharing the opposite one. Faces without an exact antipode are
+    paired through a coarser grid of the same keys, by optimal assignment
+    within small local groups (_pair_local). Normals are oriented away from
+    the origin first, so inconsistent face winding does not hide true
+    opposites. Returns pairs[i] = j (i for unpaired).
+    """
+    N, _ = outward_normals(V, F)
+    n = len(N)
+    if n == 0:
+        return []
+    if tol < 1e-6:
+        raise ValueError("tol below 1e-6 overflows the packed normal keys")
+    R = int(round(1.0 / tol)) + 1
+    B = 2 * R + 1
+
+    def keys(q):
+        q = q + R
+        return (q[:, 0] * B + q[:, 1]) * B + q[:, 2]
+
+    q = np.rint(N / tol).astype(np.int64)
+    k = keys(q)
+    order = np.argsort(k, kind="stable")
+    ks = k[order]
+    first = np.searchsorted(ks, ks, side="left")
+    rank = np.empty(n, dtype=np.intp)
+    rank[order] = np.arange(n) - first
+
+    kt = keys(-q)
+    lo = np.searchsorted(ks, kt, side="left")
+    hi = np.searchsorted(ks, kt, side="right")
+    slot = lo + rank
+    ok = slot < hi
+    j = np.where(ok, order[np.minimum(slot, n - 1)], np.arange(n))
+    ok &= j != np.arange(n)
+
+    pairs = np.where(ok, j, -1)
+    _pair_local(N, np.flatnonzero(~ok), pairs)
+    return pairs.tolist()
+
+def dual(V, F):
+    """
+    Dual polyhedron: one unit vertex per face center, one face per original
+    vertex listing its incident faces counter-clockwise about that vertex.
+    """
+    V = np.asarray(V, dtype=np.float64)
+    P, counts = pad_faces(F)
+    dV = normalize(face_centers(V, F))
+
+    mask = np.arange(P.shape[1])[None, :] < counts[:, None]
+    fi = np.broadcast_to(np.arange(len(P))[:, None], P.shape)[mask]
+    vi = P[mask]
+
+    u, v, n = tangent_frames(V)
+    p = dV[fi]
+    q = p - n[vi] * np.einsum("ij,ij->i", p, n[vi])[:, None]
+    ang = np.arctan2(np.einsum("ij,ij->i", q, v[vi]), np.einsum("ij,ij->i", q, u[vi]))
+
+    order = np.lexsort((fi, ang, vi))
+    vi, fi = vi[order], fi[order]
+    splits = np.flatnonzero(np.diff(vi)) + 1
+    return dV, [tuple(int(x) for x in g) for g in np.split(fi, splits)]
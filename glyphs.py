@@ -0,0 +1,104 @@
+"""
+Numeral glyph images for the HW4 dice decals.
+
+The font is resolved once and cached. Missing num_N.png files are rendered,
+and existing ones decoded, concurrently in a thread pool (PNG zlib work
+releases the GIL). Results come back as RGBA images or raw buffers ready
+for texture upload, so a cold start with many labels does not block on
+one glyph at a time.
+"""
+
+import os
+import sys
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+
+from PIL import Image, ImageDraw, ImageFont
+
+_MAC_FONTS = ["/Library/Fonts/Arial Bold.ttf",
+              "/System/Library/Fonts/Supplemental/Arial Bold.ttf"]
+_OTHER_FONTS = ["DejaVuSans-Bold.ttf",
+                "/usr/share/fonts/truetype/dejavu/DejaVuSans-Bold.ttf",
+                "arialbd.ttf"]
+
+def font_candidates():
+    if sys.platform == "darwin":
+        return _MAC_FONTS + _OTHER_FONTS
+    return _OTHER_FONTS + _MAC_FONTS
+
+@lru_cache(maxsize=None)
+def resolve_font_path():
+    """First candidate FreeType can open, or None for PIL's built-in font."""
+    for path in font_candidates():
+        try:
+            ImageFont.truetype(path, 12)
+            return path
+        except OSError:
+            continue
+    return None
+
+# FreeType faces are not safe to share between threads, so each worker keeps
+# its own font objects.
+_local = threading.local()
+def get_font(px):
+    fonts = getattr(_local, "fonts", None)
+    if fonts is None:
+        fonts = _local.fonts = {}
+    font = fonts.get(px)
+    if font is None:
+        path = resolve_font_path()
+        font = fonts[px] = ImageFont.truetype(path, px) if path else ImageFont.load_default()
+    return font
+
+def number_path(n, directory="."):
+    return os.path.join(directory, f"num_{n}.png")
+
+def render_number(n, size=512):
+    """Transparent size x size RGBA image with a centered black numeral."""
+    img = Image.new("RGBA", (size, size), (0, 0, 0, 0))
+    draw = ImageDraw.Draw(img)
+    font = get_font(int(size * 0.7))
+
+    text = str(n)
+    try:
+        bbox = draw.textbbox((0, 0), text, font=font)
+        w, h = bbox[2] - bbox[0], bbox[3] - bbox[1]
+    except AttributeError:
+        w, h = draw.textsize(text, font=font)
+
+    draw.text(((size - w) / 2, (size - h) / 2), text, fill=(0, 0, 0, 255), font=font)
+    return img
+
+def ensure_number_png(n, size=512, directory="."):
+    """Create num_n.png with transparent background and black digit if missing."""
+    fname = number_path(n, directory)
+    if os.path.exists(fname): return fname
+    render_number(n, size).save(fname)
+    return fname
+
+def load_number(n, size=512, cell=None, directory="."):
+    fname = number_path(n, directory)
+    if os.path.exists(fname):
+        img = Image.open(fname).convert("RGBA")
+    else:
+        img = render_number(n, size)
+        img.save(fname)
+    if cell is not None and img.size != (cell, cell):
+        img = img.resize((cell, cell), Image.LANCZOS)
+    return img
+
+def load_numbers(labels, size=512, cell=None, directory=".", workers=None):
+    """{n: RGBA image} for every label, optionally resized to cell x cell."""
+    labels = list(labels)
+    with ThreadPoolExecutor(max_workers=workers or min(8, (os.cpu_count() or 1) + 4)) as pool:
+        imgs = pool.map(lambda n: load_number(n, size, cell, directory), labels)
+        return dict(zip(labels, imgs))
+
+def number_buffers(labels, size=512, cell=None, directory=".", workers=None):
+    """
+    {n: (width, height, bytes)} ready for glTexImage2D/gluBuild2DMipmaps, in
+    the same row order upload_texture produces (source rows top first).
+    """
+    imgs = load_numbers(labels, size, cell, directory, workers)
+    return {n: (img.size[0], img.size[1], img.tobytes()) for n, img in imgs.items()}
@@ -0,0 +1,219 @@
+#!/usr/bin/env python3
+"""
+Headless frame-timing harness for starter.py, HW2.py, HW4.py and teapot.py.
+
+Each scene is rendered into an offscreen framebuffer (an EGL pbuffer on
+software Mesa, or an OSMesa buffer) for a fixed number of frames with no
+vsync or clock.tick pacing. Per-frame wall and CPU times are reported as
+JSON so draw-path regressions show up in CI. --profile adds frameprof's
+per-stage trace and GL call counts (at some cost to the timings).
+
+    python headless.py teapot --frames 300 --renderer immediate
+    python headless.py hw4 --shape 4 --backend osmesa --out hw4.json
+    python headless.py hw2 --frames 600 --profile hw2.json
+"""
+
+import argparse
+import ctypes
+import json
+import os
+import sys
+import time
+
+import frameprof
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+TEAPOT_DIR = os.path.join(ROOT, "teapot")
+
+
+class OffscreenContext:
+    """A current GL context with a width x height color+depth framebuffer."""
+
+    def __init__(self, width, height, backend="egl"):
+        self.width, self.height, self.backend = width, height, backend
+        if backend == "egl":
+            self._init_egl()
+        elif backend == "osmesa":
+            self._init_osmesa()
+        else:
+            raise ValueError(f"unknown backend {backend!r}")
+
+    def _init_egl(self):
+        from OpenGL import EGL
+        dpy = EGL.eglGetDisplay(EGL.EGL_DEFAULT_DISPLAY)
+        if not dpy or not EGL.eglInitialize(dpy, None, None):
+            raise RuntimeError("eglInitialize failed (try EGL_PLATFORM=surfaceless)")
+        attrs = [
+            EGL.EGL_SURFACE_TYPE, EGL.EGL_PBUFFER_BIT,
+            EGL.EGL_RED_SIZE, 8, EGL.EGL_GREEN_SIZE, 8, EGL.EGL_BLUE_SIZE, 8,
+            EGL.EGL_ALPHA_SIZE, 8, EGL.EGL_DEPTH_SIZE, 24,
+            EGL.EGL_RENDERABLE_TYPE, EGL.EGL_OPENGL_BIT,
+            EGL.EGL_NONE,
+        ]
+        cfg, n = EGL.EGLConfig(), EGL.EGLint()
+        if not EGL.eglChooseConfig(dpy, (EGL.EGLint * len(attrs))(*attrs),
+                                   ctypes.pointer(cfg), 1, ctypes.pointer(n)) or n.value < 1:
+            raise RuntimeError("no EGL config with desktop GL + pbuffer support")
+        size = (EGL.EGLint * 5)(EGL.EGL_WIDTH, self.width, EGL.EGL_HEIGHT, self.height, EGL.EGL_NONE)
+        surf = EGL.eglCreatePbufferSurface(dpy, cfg, size)
+        EGL.eglBindAPI(EGL.EGL_OPENGL_API)
+        ctx = EGL.eglCreateContext(dpy, cfg, EGL.EGL_NO_CONTEXT, None)
+        if not EGL.eglMakeCurrent(dpy, surf, surf, ctx):
+            raise RuntimeError("eglMakeCurrent failed")
+        EGL.eglSwapInterval(dpy, 0)
+        self._egl = (dpy, surf, ctx)
+
+    def _init_osmesa(self):
+        from OpenGL import GL, arrays, osmesa
+        ctx = osmesa.OSMesaCreateContextExt(osmesa.OSMESA_RGBA, 24, 0, 0, None)
+        if not ctx:
+            raise RuntimeError("OSMesaCreateContextExt failed")
+        self._buf = arrays.GLubyteArray.zeros((self.height, self.width, 4))
+        if not osmesa.OSMesaMakeCurrent(ctx, self._buf, GL.GL_UNSIGNED_BYTE, self.width, self.height):
+            raise RuntimeError("OSMesaMakeCurrent failed")
+        self._osmesa = ctx
+
+    def read_rgb(self):
+        import numpy as np
+        from OpenGL import GL
+        GL.glPixelStorei(GL.GL_PACK_ALIGNMENT, 1)
+        data = GL.glReadPixels(0, 0, self.width, self.height, GL.GL_RGB, GL.GL_UNSIGNED_BYTE)
+        return np.frombuffer(data, np.uint8).reshape(self.height, self.width, 3)[::-1]
+
+
+def scene_starter(args):
+    os.chdir(ROOT)
+    import starter
+    starter.init_view()
+    return lambda i: starter.render(args.shape)
+
+def scene_hw2(args):
+    os.chdir(ROOT)
+    import HW2
+    HW2.init_gl()
+    HW2.set_viewport(args.width, args.height)
+    sim = HW2.SimClock(warp=args.warp)
+
+    def frame(i):
+        # Fixed 60 Hz of simulated real time per frame keeps runs reproducible.
+        with frameprof.scope("simulate"):
+            sim.advance(1.0 / 60.0)
+            angles, moon_angle = HW2.angles_at(sim.render_days())
+        HW2.draw_scene(angles, moon_angle, 90.0)
+    return frame
+
+def scene_hw4(args):
+    os.chdir(ROOT)
+    import HW4
+    HW4.init_scene((args.width, args.height))
+    return lambda i: HW4.render(args.shape, (i * 40.0 / 60.0) % 360.0)
+
+def scene_teapot(args):
+    os.chdir(TEAPOT_DIR)
+    sys.path.insert(0, TEAPOT_DIR)
+    import teapot
+    teapot.parse_args(args.scene_args)
+    teapot.load_obj("teapot.obj")
+    if teapot.LOD != "off":
+        teapot.load_lods("teapot.obj")
+    teapot.compute_normals()
+    teapot.reshape(args.width, args.height)
+    teapot.init_lighting()
+    teapot.init_material()
+    teapot.build_mesh()
+
+    def frame(i):
+        # As teapot.display does, so --lod picks the level that is timed.
+        teapot.select_lod()
+        teapot.render()
+        teapot.angle = (teapot.angle + 5.0) % 360.0
+    return frame
+
+SCENES = {
+    "starter": scene_starter,
+    "hw2": scene_hw2,
+    "hw4": scene_hw4,
+    "teapot": scene_teapot,
+}
+
+
+def percentiles(samples_ms):
+    import numpy as np
+    a = np.asarray(samples_ms, dtype=np.float64)
+    p50, p95, p99 = np.percentile(a, [50, 95, 99])
+    return {"mean": float(a.mean()), "p50": float(p50), "p95": float(p95),
+            "p99": float(p99), "max": float(a.max())}
+
+def run(frame, frames, warmup):
+    from OpenGL.GL import glFinish
+    for i in range(warmup):
+        frame(i)
+        frameprof.frame()
+    glFinish()
+    wall, cpu = [], []
+    start = time.perf_counter()
+    for i in range(warmup, warmup + frames):
+        t0, c0 = time.perf_counter(), time.process_time()
+        frame(i)
+        glFinish()
+        frameprof.frame()
+        wall.append((time.perf_counter() - t0) * 1000.0)
+        cpu.append((time.process_time() - c0) * 1000.0)
+    return wall, cpu, time.perf_counter() - start
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="Render a scene offscreen and report frame timings as JSON.")
+    ap.add_argument("scene", choices=sorted(SCENES))
+    ap.add_argument("--frames", type=int, default=300)
+    ap.add_argument("--warmup", type=int, default=10)
+    ap.add_argument("--width", type=int, default=800)
+    ap.add_argument("--height", type=int, default=600)
+    ap.add_argument("--backend", choices=("egl", "osmesa"), default="egl")
+    ap.add_argument("--shape", type=int, default=2, choices=range(1, 6),
+                    help="solid for starter/hw4 (1=tetra .. 5=icosa)")
+    ap.add_argument("--warp", type=float, default=1.0, help="hw2 time-warp multiplier")
+    ap.add_argument("--per-frame", action="store_true", help="include raw per-frame samples")
+    ap.add_argument("--out", help="write JSON here instead of stdout")
+    ap.add_argument("--profile", metavar="TRACE",
+                    help="write a Chrome trace of stages and GL calls here (summaries on stderr)")
+    args, args.scene_args = ap.parse_known_args(argv)
+
+    # PyOpenGL picks its platform on first import, so this has to happen first.
+    os.environ.setdefault("PYOPENGL_PLATFORM", args.backend)
+    if args.backend == "egl":
+        os.environ.setdefault("EGL_PLATFORM", "surfaceless")
+    # Keep pygame's import banner out of the JSON on stdout.
+    os.environ.setdefault("PYGAME_HIDE_SUPPORT_PROMPT", "1")
+    out_path = os.path.abspath(args.out) if args.out else None
+    # Before the scene modules import, so their timed() stages wrap.
+    if args.profile:
+        frameprof.enable(os.path.abspath(args.profile), stream=sys.stderr)
+
+    ctx = OffscreenContext(args.width, args.height, args.backend)
+    from OpenGL.GL import GL_RENDERER, glGetString
+    frame = SCENES[args.scene](args)
+    wall, cpu, total = run(frame, args.frames, args.warmup)
+
+    report = {
+        "scene": args.scene,
+        "backend": ctx.backend,
+        "renderer": glGetString(GL_RENDERER).decode(),
+        "size": [args.width, args.height],
+        "frames": args.frames,
+        "fps": args.frames / total if total > 0 else float("inf"),
+        "wall_ms": percentiles(wall),
+        "cpu_ms": percentiles(cpu),
+    }
+    if args.per_frame:
+        report["samples"] = {"wall_ms": wall, "cpu_ms": cpu}
+    text = json.dumps(report, indent=2)
+    if out_path:
+        with open(out_path, "w") as f:
+            f.write(text + "\n")
+    else:
+        print(text)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,42 @@
+"""
+Deferred star imports for the scene scripts.
+
+The scripts call GL and pygame through bare names (glBegin, GL_LINES,
+K_1, ...). Rather than importing those stacks at module import, each
+script calls load_gl / load_pygame from its entry points, which copy the
+same public names into the script's globals on first use. Importing a
+script for its math (geometry, tables, labels) then costs only NumPy.
+"""
+
+import importlib
+
+import frameprof
+
+
+def star_import(namespace, *modules):
+    """
+    `from m import *` into namespace for each module, except that names the
+    namespace already defines are kept, as if the import had come first.
+    Returns the last module.
+    """
+    mod = None
+    for name in modules:
+        mod = importlib.import_module(name)
+        public = getattr(mod, "__all__", None)
+        if public is None:
+            public = [k for k in vars(mod) if not k.startswith("_")]
+        for k in public:
+            namespace.setdefault(k, getattr(mod, k))
+    return mod
+
+def load_gl(namespace, glut=False):
+    if "glBegin" not in namespace:
+        star_import(namespace, "OpenGL.GL", "OpenGL.GLU")
+    if glut and "glutInit" not in namespace:
+        star_import(namespace, "OpenGL.GLUT")
+    frameprof.wrap_gl(namespace)
+
+def load_pygame(namespace):
+    if "pygame" not in namespace:
+        namespace["pygame"] = importlib.import_module("pygame")
+        star_import(namespace, "pygame.locals")
@@ -0,0 +1,68 @@
+"""
+Vectorized Wavefront OBJ reading, shared by teapot.py and dice_batch.py.
+
+Only v and f records are read. Every record goes into one NumPy token
+stream, so a file costs a few array passes instead of a Python loop per
+line. Faces come back as polygons, given as flat corner indices plus
+per-face counts. triangulate() fans them into triangles.
+"""
+
+import re
+
+import numpy as np
+
+_RECORDS = (b"v ", b"f ")
+
+
+def read_polygons(path, dtype=np.float32):
+    """
+    Vertices and faces of an OBJ file: V (n, 3) of dtype, every face's
+    0-based corner indices in one flat int64 array, and each face's corner
+    count. Negative (relative) indices are resolved. Faces with fewer than
+    three corners are dropped.
+    """
+    with open(path, "rb") as f:
+        raw = f.read()
+    recs = [l for l in map(bytes.lstrip, raw.splitlines()) if l[:2] in _RECORDS]
+    if not recs:
+        return np.empty((0, 3), dtype), np.empty(0, np.int64), np.empty(0, np.int64)
+
+    # One token stream for every v/f record; "a/b/c" corners keep only the position index.
+    tok = np.array(re.sub(rb"/\S*", b"", b" ".join(recs)).split())
+    is_v = tok == b"v"
+    starts = np.flatnonzero(is_v | (tok == b"f"))
+    ends = np.append(starts[1:], len(tok))
+    rec_v = is_v[starts]
+
+    vs = starts[rec_v]
+    V = tok[(vs[:, None] + np.arange(1, 4)).ravel()].astype(dtype).reshape(-1, 3)
+
+    fs, fe = starts[~rec_v] + 1, ends[~rec_v]
+    counts = fe - fs
+    keep = counts >= 3
+    fs, counts = fs[keep], counts[keep]
+    # Relative (negative) indices are resolved against the vertices seen so far.
+    seen = np.repeat(np.cumsum(rec_v)[~rec_v][keep], counts)
+
+    corner = np.repeat(fs - np.cumsum(counts) + counts, counts) + np.arange(counts.sum())
+    ids = tok[corner].astype(np.int64)
+    ids = np.where(ids < 0, seen + ids, ids - 1)
+    return V, ids, counts.astype(np.int64)
+
+def triangulate(ids, counts):
+    """(T, 3) fan triangles of the polygons read_polygons returns."""
+    first = np.cumsum(counts) - counts
+    ntri = counts - 2
+    face = np.repeat(np.arange(len(counts)), ntri)
+    j = np.arange(ntri.sum()) - np.repeat(np.cumsum(ntri) - ntri, ntri) + 1
+    corner = np.stack([first[face], first[face] + j, first[face] + j + 1], axis=1)
+    return ids[corner]
+
+def polygons(ids, counts):
+    """Faces as a list of tuples of Python ints."""
+    flat = ids.tolist()
+    F, s = [], 0
+    for c in counts.tolist():
+        F.append(tuple(flat[s:s + c]))
+        s += c
+    return F
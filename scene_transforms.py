@@ -0,0 +1,65 @@
+"""
+Pure-NumPy transforms for orbiting bodies.
+
+Each body i sits at orbit_radius[i] from its parent, rotated by angle[i]
+degrees about the parent's z axis, i.e. local = Rz(angle) @ T(r, 0, 0),
+matching the glRotatef/glTranslatef chain in HW2. World matrices are
+composed one hierarchy level at a time, all bodies of a level in a single
+batched matmul, so any depth of planet/moon nesting works and body
+positions are available on the CPU without reading back GL state.
+"""
+
+import numpy as np
+
+
+def rotation_x(deg):
+    c, s = np.cos(np.radians(deg)), np.sin(np.radians(deg))
+    M = np.eye(4)
+    M[1, 1], M[1, 2], M[2, 1], M[2, 2] = c, -s, s, c
+    return M
+
+def translation(x, y, z):
+    M = np.eye(4)
+    M[:3, 3] = (x, y, z)
+    return M
+
+def local_matrices(angles_deg, orbit_radius):
+    a = np.radians(np.asarray(angles_deg, dtype=np.float64))
+    r = np.asarray(orbit_radius, dtype=np.float64)
+    c, s = np.cos(a), np.sin(a)
+    M = np.zeros((len(a), 4, 4))
+    M[:, 0, 0], M[:, 0, 1], M[:, 1, 0], M[:, 1, 1] = c, -s, s, c
+    M[:, 2, 2] = M[:, 3, 3] = 1.0
+    M[:, 0, 3], M[:, 1, 3] = r * c, r * s
+    return M
+
+def hierarchy_levels(parents):
+    """Body indices grouped by depth (roots first); parents[i] is -1 for a root."""
+    parents = np.asarray(parents)
+    if not len(parents):
+        return []
+    depth = np.zeros(len(parents), dtype=np.int64)
+    for _ in range(len(parents)):
+        nd = np.where(parents < 0, 0, depth[parents] + 1)
+        if np.array_equal(nd, depth):
+            break
+        depth = nd
+    else:
+        raise ValueError("cycle in body parent table")
+    return [np.flatnonzero(depth == d) for d in range(depth.max() + 1)]
+
+def world_matrices(parents, angles_deg, orbit_radius, levels=None):
+    parents = np.asarray(parents)
+    W = local_matrices(angles_deg, orbit_radius)
+    for idx in (levels if levels is not None else hierarchy_levels(parents))[1:]:
+        W[idx] = W[parents[idx]] @ W[idx]
+    return W
+
+def positions(world):
+    return world[:, :3, 3].copy()
+
+def model_view(view, world, scale):
+    """view @ world @ S(scale) per body, in glLoadMatrixf (column-major) order."""
+    M = view @ world
+    M[:, :3, :3] *= np.asarray(scale, dtype=np.float64)[:, None, None]
+    return np.ascontiguousarray(M.transpose(0, 2, 1), dtype=np.float32)
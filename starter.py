@@ -6,35 +6,36 @@ This is the starter code for the first homework assignment.
 It should run as is and will serve as the starting point for development.
 """
 
+import ctypes
 import math
-import pygame
-from pygame.locals import *
-from OpenGL.GL import *
-from OpenGL.GLU import *
 
+import frameprof
+import mesh_edges
+from lazyload import load_gl, load_pygame
+
+
+_d = 1.0 / math.sqrt(3.0) #ToDo: This is the default but is too large and needs to be changed
+_CV = (
+    (_d, -_d, -_d),
+    (_d, _d, -_d),
+    (-_d, _d, -_d),
+    (-_d, -_d, -_d),
+    (_d, -_d, _d),
+    (_d, _d, _d),
+    (-_d, -_d, _d),
+    (-_d, _d, _d)
+    )
+_CE = (
+    (0,1), (0,3), (0,4), (2,1), (2,3), (2,7),
+    (6,3), (6,4), (6,7), (5,1), (5,4), (5,7)
+    )
 
 def Cube():
-    d = 1.0 / math.sqrt(3.0) #ToDo: This is the default but is too large and needs to be changed
-    verticies = (
-        (d, -d, -d),
-        (d, d, -d),
-        (-d, d, -d),
-        (-d, -d, -d),
-        (d, -d, d),
-        (d, d, d),
-        (-d, -d, d),
-        (-d, d, d)
-        )
-
-    edges = (
-        (0,1), (0,3), (0,4), (2,1), (2,3), (2,7),
-        (6,3), (6,4), (6,7), (5,1), (5,4), (5,7)
-        )
     glColor(1,1,1) # Draw the cube in white
     glBegin(GL_LINES)
-    for edge in edges:
+    for edge in _CE:
         for vertex in edge:
-            glVertex3fv(verticies[vertex])
+            glVertex3fv(_CV[vertex])
     glEnd()
 
 
@@ -52,17 +53,17 @@ def Axes():
     glEnd()
 
 
+_CIRCLE = [(math.cos(2.0 * math.pi * i / 36), math.sin(2.0 * math.pi * i / 36), 0)
+           for i in range(36)]
+
 def Circle():
     glPushMatrix()
     glLoadIdentity()
     glOrtho(-2, 2, -2, 2, -2, 2)
     glColor(1,0,1) # Purple for the limits
     glBegin(GL_LINE_LOOP)
-    for i in range(36):
-        angle = 2.0 * math.pi * i / 36
-        x = math.cos(angle)
-        y = math.sin(angle)
-        glVertex3fv((x, y, 0))
+    for p in _CIRCLE:
+        glVertex3fv(p)
     glEnd()
     glPopMatrix()
 
@@ -73,15 +74,7 @@ def normalize_vertices(vertices):
     return [(x*s, y*s, z*s) for x,y,z in vertices]
 
 def unique_edges_from_faces(faces):
-    seen = set(); out = []
-    for f in faces:
-        n = len(f)
-        for i in range(n):
-            a,b = f[i], f[(i+1)%n]
-            e = (a,b) if a<b else (b,a)
-            if e not in seen:
-                seen.add(e); out.append(e)
-    return out
+    return [tuple(e) for e in mesh_edges.face_edges(faces).tolist()]
 
 def draw_edges(vertices, edges):
     glColor(1,1,1)
@@ -135,66 +128,165 @@ for sx in (-1,1):
 _DV = normalize_vertices(_DV)
 
 def _edges_from_shortest_dist(vertices):
-    n = len(vertices)
-    pairs = []
-    md = None
-    for i in range(n):
-        xi,yi,zi = vertices[i]
-        for j in range(i+1, n):
-            xj,yj,zj = vertices[j]
-            dx = xi - xj; dy = yi - yj; dz = zi - zj
-            d = (dx*dx + dy*dy + dz*dz) ** 0.5
-            if md is None or d < md:
-                md = d
-            pairs.append((d, i, j))
-    thr = md * (1.0 + 1e-5)
-    return [(i, j) for d, i, j in pairs if d <= thr]
+    return [tuple(e) for e in mesh_edges.shortest_edges(vertices).tolist()]
 
 _DE = _edges_from_shortest_dist(_DV)
 def Dodecahedron():
     draw_edges(_DV, _DE)
     
 
+def ortho(l, r, b, t, n, f):
+    """The glOrtho matrix, column-major for glLoadMatrixf."""
+    return (2.0/(r-l), 0, 0, 0,
+            0, 2.0/(t-b), 0, 0,
+            0, 0, -2.0/(f-n), 0,
+            -(r+l)/(r-l), -(t+b)/(t-b), -(f+n)/(f-n), 1)
+
+# What Circle builds with glLoadIdentity + glOrtho.
+_LIMIT_VIEW = ortho(-2, 2, -2, 2, -2, 2)
+
+def line_shapes():
+    """name -> (vertices, edges, colors); colors is one RGB or one per vertex."""
+    white = (1,1,1)
+    axes = [(0,0,0), (1.5,0,0), (0,0,0), (0,1.5,0), (0,0,0), (0,0,1.5)]
+    axes_colors = [(1,0,0)]*2 + [(0,1,0)]*2 + [(0,0,1)]*2
+    ring = [(i, (i+1) % len(_CIRCLE)) for i in range(len(_CIRCLE))]
+    return {
+        "axes": (axes, [(0,1), (2,3), (4,5)], axes_colors),
+        "circle": (_CIRCLE, ring, (1,0,1)),
+        1: (_TV, _TE, white),
+        2: (_CV, _CE, white),
+        3: (_OV, _OE, white),
+        4: (_DV, _DE, white),
+        5: (_IV, _IE, white),
+    }
+
+class LineBuffer:
+    """
+    Every wireframe packed once into one vertex buffer (position + color)
+    and one GL_LINES index buffer. draw(name) is a single glDrawElements
+    over that shape's index range, so a frame costs the same Python work
+    whatever the edge count.
+    """
+    STRIDE = 6 * 4
+
+    def __init__(self, shapes):
+        data, index, self.ranges = [], [], {}
+        for name, (V, E, colors) in shapes.items():
+            if isinstance(colors[0], (int, float)):
+                colors = [colors] * len(V)
+            base = len(data) // 6
+            for p, c in zip(V, colors):
+                data.extend(p); data.extend(c)
+            self.ranges[name] = (4 * len(index), 2 * len(E))
+            for a, b in E:
+                index.extend((base + a, base + b))
+        vbuf = (ctypes.c_float * len(data))(*data)
+        ibuf = (ctypes.c_uint32 * len(index))(*index)
+        self.vbo, self.ibo = glGenBuffers(2)
+        glBindBuffer(GL_ARRAY_BUFFER, self.vbo)
+        glBufferData(GL_ARRAY_BUFFER, ctypes.sizeof(vbuf), vbuf, GL_STATIC_DRAW)
+        glBindBuffer(GL_ELEMENT_ARRAY_BUFFER, self.ibo)
+        glBufferData(GL_ELEMENT_ARRAY_BUFFER, ctypes.sizeof(ibuf), ibuf, GL_STATIC_DRAW)
+        glBindBuffer(GL_ARRAY_BUFFER, 0)
+        glBindBuffer(GL_ELEMENT_ARRAY_BUFFER, 0)
+
+    def bind(self):
+        glEnableClientState(GL_VERTEX_ARRAY)
+        glEnableClientState(GL_COLOR_ARRAY)
+        glBindBuffer(GL_ARRAY_BUFFER, self.vbo)
+        glBindBuffer(GL_ELEMENT_ARRAY_BUFFER, self.ibo)
+        glVertexPointer(3, GL_FLOAT, self.STRIDE, ctypes.c_void_p(0))
+        glColorPointer(3, GL_FLOAT, self.STRIDE, ctypes.c_void_p(12))
+
+    def draw(self, name):
+        offset, count = self.ranges[name]
+        glDrawElements(GL_LINES, count, GL_UNSIGNED_INT, ctypes.c_void_p(offset))
+
+    def unbind(self):
+        glBindBuffer(GL_ARRAY_BUFFER, 0)
+        glBindBuffer(GL_ELEMENT_ARRAY_BUFFER, 0)
+        glDisableClientState(GL_COLOR_ARRAY)
+        glDisableClientState(GL_VERTEX_ARRAY)
+
+    def delete(self):
+        if self.vbo is not None:
+            glDeleteBuffers(2, [self.vbo, self.ibo])
+            self.vbo = self.ibo = None
+
+lines = None
+
+def init_view(use_buffers=True):
+    global lines
+    load_gl(globals())
+    glOrtho(-2, 2, -2, 2, -2, 2)
+    glMatrixMode(GL_MODELVIEW)
+    lines = LineBuffer(line_shapes()) if use_buffers else None
+
+
+@frameprof.timed("render")
+def render(current):
+    glRotatef(1, 1, 1, 1)
+    glClear(GL_COLOR_BUFFER_BIT|GL_DEPTH_BUFFER_BIT)
+    if lines is None:
+        draw_immediate(current)
+        return
+    lines.bind()
+    lines.draw("axes")
+    lines.draw(current if current in (1, 2, 3, 4) else 5)
+    glPushMatrix()
+    glLoadMatrixf(_LIMIT_VIEW)
+    lines.draw("circle")
+    glPopMatrix()
+    lines.unbind()
+
+
+def draw_immediate(current):
+    Axes()
+    if current == 1:
+        Tetrahedron()
+    elif current == 2:
+        Cube()
+    elif current == 3:
+        Octahedron()
+    elif current == 4:
+        Dodecahedron()
+    else:
+        Icosahedron()
+    Circle()
+
+
 def main():
+    load_pygame(globals())
     pygame.init()
     display = (800,800)
     pygame.display.set_mode(display, DOUBLEBUF|OPENGL)
     pygame.display.set_caption('Homework #1 - Amin Aden') #ToDo: Change this 
-    glOrtho(-2, 2, -2, 2, -2, 2)
-    glMatrixMode(GL_MODELVIEW)
+    init_view()
     
     current = 2
 
     while True:
-        for event in pygame.event.get():
-            if event.type == pygame.QUIT:
-                pygame.quit()
-                return
-            if event.type == pygame.KEYDOWN:
-                key_to_shape = {
-                    K_1: 1, K_2: 2, K_3: 3, K_4: 4, K_5: 5,
-                    K_KP1: 1, K_KP2: 2, K_KP3: 3, K_KP4: 4, K_KP5: 5,
-                }
-                if event.key in key_to_shape:
-                    current = key_to_shape[event.key]
-
-        glRotatef(1, 1, 1, 1)
-        glClear(GL_COLOR_BUFFER_BIT|GL_DEPTH_BUFFER_BIT)
-        Axes()
-        if current == 1:
-            Tetrahedron()
-        elif current == 2:
-            Cube()
-        elif current == 3:
-            Octahedron()
-        elif current == 4:
-            Dodecahedron()
-        else:
-            Icosahedron()
-        Circle()
-        
-        pygame.display.flip()
+        with frameprof.scope("events"):
+            for event in pygame.event.get():
+                if event.type == pygame.QUIT:
+                    pygame.quit()
+                    return
+                if event.type == pygame.KEYDOWN:
+                    key_to_shape = {
+                        K_1: 1, K_2: 2, K_3: 3, K_4: 4, K_5: 5,
+                        K_KP1: 1, K_KP2: 2, K_KP3: 3, K_KP4: 4, K_KP5: 5,
+                    }
+                    if event.key in key_to_shape:
+                        current = key_to_shape[event.key]
+
+        render(current)
+
+        with frameprof.scope("flip"):
+            pygame.display.flip()
+        frameprof.frame()
         pygame.time.wait(10)
 
 
-main()
+if __name__ == "__main__":
+    main()
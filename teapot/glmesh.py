@@ -0,0 +1,82 @@
+"""
+Retained-mode triangle mesh for the fixed-function pipeline.
+
+Positions, normals and indices are uploaded once into a vertex buffer and
+an index buffer, and each frame is a single glDrawElements call. With
+use_vbo=False the same arrays are drawn as client-side vertex arrays, for
+contexts without buffer objects.
+"""
+
+import ctypes
+
+import numpy as np
+from OpenGL.GL import *
+
+import frameprof
+
+frameprof.wrap_gl(globals())
+
+
+def expand_flat(V, N, T):
+    """Give every triangle its own three corners so per-face normals survive indexing."""
+    V = np.asarray(V, dtype=np.float32)
+    T = np.asarray(T, dtype=np.intp)
+    P = V[T.ravel()]
+    Nv = np.repeat(np.asarray(N, dtype=np.float32), 3, axis=0)
+    return P, Nv, np.arange(len(P), dtype=np.uint32).reshape(-1, 3)
+
+
+class GLMesh:
+    STRIDE = 6 * 4
+
+    def __init__(self, V, N, T, flat=False, use_vbo=True):
+        """N holds one normal per vertex, or one per triangle when flat is set."""
+        V = np.asarray(V, dtype=np.float32)
+        N = np.asarray(N, dtype=np.float32)
+        T = np.asarray(T)
+        if flat:
+            V, N, T = expand_flat(V, N, T)
+        self.interleaved = np.ascontiguousarray(np.hstack([V, N]), dtype=np.float32)
+        self.indices = np.ascontiguousarray(T, dtype=np.uint32).ravel()
+        self.count = len(self.indices)
+        self.use_vbo = use_vbo
+        self.vbo = self.ibo = None
+        if use_vbo:
+            self.vbo, self.ibo = glGenBuffers(2)
+            glBindBuffer(GL_ARRAY_BUFFER, self.vbo)
+            glBufferData(GL_ARRAY_BUFFER, self.interleaved.nbytes, self.interleaved, GL_STATIC_DRAW)
+            glBindBuffer(GL_ELEMENT_ARRAY_BUFFER, self.ibo)
+            glBufferData(GL_ELEMENT_ARRAY_BUFFER, self.indices.nbytes, self.indices, GL_STATIC_DRAW)
+            glBindBuffer(GL_ARRAY_BUFFER, 0)
+            glBindBuffer(GL_ELEMENT_ARRAY_BUFFER, 0)
+
+    @frameprof.timed("GLMesh.draw")
+    def draw(self, ranges=None):
+        """Draw every triangle, or only the (first, count) triangle runs in ranges."""
+        if ranges is None:
+            ranges = [(0, self.count // 3)]
+        glEnableClientState(GL_VERTEX_ARRAY)
+        glEnableClientState(GL_NORMAL_ARRAY)
+        if self.use_vbo:
+            glBindBuffer(GL_ARRAY_BUFFER, self.vbo)
+            glBindBuffer(GL_ELEMENT_ARRAY_BUFFER, self.ibo)
+            glVertexPointer(3, GL_FLOAT, self.STRIDE, ctypes.c_void_p(0))
+            glNormalPointer(GL_FLOAT, self.STRIDE, ctypes.c_void_p(12))
+            for first, count in ranges:
+                glDrawElements(GL_TRIANGLES, 3 * count, GL_UNSIGNED_INT, ctypes.c_void_p(12 * first))
+            glBindBuffer(GL_ARRAY_BUFFER, 0)
+            glBindBuffer(GL_ELEMENT_ARRAY_BUFFER, 0)
+        else:
+            base = self.interleaved.ctypes.data
+            glVertexPointer(3, GL_FLOAT, self.STRIDE, ctypes.c_void_p(base))
+            glNormalPointer(GL_FLOAT, self.STRIDE, ctypes.c_void_p(base + 12))
+            for first, count in ranges:
+                glDrawElements(GL_TRIANGLES, 3 * count, GL_UNSIGNED_INT,
+                               self.indices[3 * first:3 * (first + count)])
+        glDisableClientState(GL_NORMAL_ARRAY)
+        glDisableClientState(GL_VERTEX_ARRAY)
+
+    def delete(self):
+        if self.vbo is not None:
+            glDeleteBuffers(2, [self.vbo, self.ibo])
+            self.vbo = self.ibo = None
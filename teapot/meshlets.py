@@ -0,0 +1,148 @@
+"""
+CPU-side cluster culling for large triangle meshes.
+
+Triangles are grouped into meshlets of up to MESHLET_TRIANGLES: first by
+the direction of their normal, then in Morton order of their centroids,
+so each cluster is small in space and narrow in normal direction. Without
+back-face culling the meshlets are just runs of the input order. Every
+meshlet keeps a bounding sphere and a normal cone (axis plus half-angle).
+Each frame, visible() rejects whole meshlets that are outside the view
+frustum or whose every triangle faces away from the eye, and runs() turns
+the survivors into a few contiguous index ranges to submit.
+"""
+
+import numpy as np
+
+MESHLET_TRIANGLES = 64
+# Normals are binned on a cube map with NORMAL_BINS x NORMAL_BINS cells per
+# face before spatial ordering; finer bins give narrower cones.
+NORMAL_BINS = 4
+
+
+def _morton(P):
+    """30-bit Morton codes of points, quantized to 10 bits per axis over their bounding box."""
+    lo, hi = P.min(axis=0), P.max(axis=0)
+    q = ((P - lo) / np.maximum(hi - lo, 1e-12) * 1023.0).astype(np.int64)
+    code = np.zeros(len(P), dtype=np.int64)
+    for bit in range(10):
+        for axis in range(3):
+            code |= ((q[:, axis] >> bit) & 1) << (3 * bit + axis)
+    return code
+
+def _normal_bins(n, bins):
+    """Cube-map cell of each direction: dominant axis and sign, then a bins x bins grid on that face."""
+    dom = np.argmax(np.abs(n), axis=1)
+    rows = np.arange(len(n))
+    major = n[rows, dom]
+    face = 2 * dom + (major < 0)
+    uv = np.stack([n[rows, (dom + 1) % 3], n[rows, (dom + 2) % 3]], axis=1)
+    uv = uv / np.where(major == 0, 1.0, np.abs(major))[:, None]
+    cell = np.clip(((uv + 1.0) * 0.5 * bins).astype(np.int64), 0, bins - 1)
+    return (face * bins + cell[:, 0]) * bins + cell[:, 1]
+
+def is_closed(T):
+    """True when every edge is shared by exactly two triangles, traversed in opposite directions."""
+    T = np.asarray(T, dtype=np.int64)
+    a, b = T.ravel(), T[:, [1, 2, 0]].ravel()
+    n = int(T.max()) + 1 if T.size else 1
+    keys = np.sort(a * n + b)
+    if len(keys) == 0 or np.any(keys[1:] == keys[:-1]):
+        return False
+    rev = b * n + a
+    return bool(np.all(keys[np.minimum(np.searchsorted(keys, rev), len(keys) - 1)] == rev))
+
+def frustum_planes(mvp):
+    """The six clip planes (a, b, c, d), normalized, of a row-major projection * model-view matrix."""
+    m = np.asarray(mvp, dtype=np.float64)
+    P = np.stack([m[3] + m[0], m[3] - m[0], m[3] + m[1],
+                  m[3] - m[1], m[3] + m[2], m[3] - m[2]])
+    return P / np.linalg.norm(P[:, :3], axis=1, keepdims=True)
+
+
+class Meshlets:
+    def __init__(self, V, T, size=MESHLET_TRIANGLES, bins=NORMAL_BINS, backface=None):
+        """
+        order is the triangle permutation that makes every meshlet a
+        contiguous run; draw T[order]. backface=None culls back-facing
+        meshlets only when the mesh is closed, since an open mesh (like
+        teapot.obj) shows its inside through the openings.
+        """
+        V = np.asarray(V, dtype=np.float64)
+        T = np.asarray(T, dtype=np.int64)
+        self.backface = is_closed(T) if backface is None else backface
+
+        P = V[T]
+        n = np.cross(P[:, 1] - P[:, 0], P[:, 2] - P[:, 0])
+        ln = np.linalg.norm(n, axis=1)
+        live = ln > 1e-12
+        n[live] /= ln[live, None]
+
+        if self.backface:
+            bucket = _normal_bins(n, bins)
+            order = np.lexsort((_morton(P.mean(axis=1)), bucket))
+            b = bucket[order]
+            key = b * len(T) + (np.arange(len(T)) - np.searchsorted(b, b)) // size
+        else:
+            # Frustum tests alone gain nothing from normal grouping, so the
+            # input order is kept (it is already local, and cache-ordered
+            # after meshopt) and cut into consecutive meshlets.
+            order = np.arange(len(T))
+            key = order // size
+        self.order = order
+        self.first = np.flatnonzero(np.r_[True, np.diff(key) != 0])
+        self.count = np.diff(np.r_[self.first, len(T)])
+
+        corners = P[order].reshape(-1, 3)
+        lo = np.minimum.reduceat(corners, 3 * self.first)
+        hi = np.maximum.reduceat(corners, 3 * self.first)
+        self.center = (lo + hi) * 0.5
+        reach = np.linalg.norm(corners - np.repeat(self.center, 3 * self.count, axis=0), axis=1)
+        self.radius = np.maximum.reduceat(reach, 3 * self.first)
+
+        # Degenerate triangles draw nothing, so they are left out of the cones.
+        n, live = n[order], live[order]
+        axis = np.add.reduceat(n, self.first)
+        la = np.linalg.norm(axis, axis=1)
+        axis[la > 0] /= la[la > 0, None]
+        dots = np.where(live, np.einsum("ij,ij->i", n, np.repeat(axis, self.count, axis=0)), 1.0)
+        self.axis = axis
+        self.cos_cone = np.where(la > 0, np.minimum.reduceat(dots, self.first), -1.0)
+        self.sin_cone = np.sqrt(np.maximum(0.0, 1.0 - self.cos_cone ** 2))
+        # Closest any triangle's plane comes to the center, on its front side.
+        ahead = np.einsum("ij,ij->i", n, P[order, 0] - np.repeat(self.center, self.count, axis=0))
+        self.plane_min = np.minimum.reduceat(np.where(live, ahead, np.inf), self.first)
+
+    def __len__(self):
+        return len(self.first)
+
+    def visible(self, mvp, eye):
+        """
+        Per-meshlet mask for a row-major projection * model-view matrix and the
+        eye position, both in the mesh's own coordinates.
+        """
+        planes = frustum_planes(mvp)
+        dist = self.center @ planes[:, :3].T + planes[:, 3]
+        keep = np.all(dist >= -self.radius[:, None], axis=1)
+        if self.backface:
+            # Triangle i faces the eye when n.(eye - c) > n.(p - c). The left
+            # side is at most |w| cos(max(angle(w, axis) - cone, 0)) with
+            # w = eye - c, and the right side is at least plane_min.
+            w = np.asarray(eye, dtype=np.float64) - self.center
+            along = np.einsum("ij,ij->i", w, self.axis)
+            length = np.linalg.norm(w, axis=1)
+            across = np.sqrt(np.maximum(0.0, length ** 2 - along ** 2))
+            reach = np.where(along > length * self.cos_cone, length,
+                             along * self.cos_cone + across * self.sin_cone)
+            keep &= reach > self.plane_min
+        return keep
+
+    def runs(self, mask):
+        """(first triangle, triangle count) of each maximal run of visible meshlets."""
+        idx = np.flatnonzero(mask)
+        if len(idx) == 0:
+            return []
+        breaks = np.flatnonzero(np.diff(idx) != 1) + 1
+        starts = idx[np.r_[0, breaks]]
+        ends = idx[np.r_[breaks - 1, len(idx) - 1]]
+        return list(zip(self.first[starts].tolist(),
+                        (self.first[ends] + self.count[ends] - self.first[starts]).tolist()))
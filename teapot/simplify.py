@@ -0,0 +1,218 @@
+"""
+Mesh simplification by quadric error metrics and edge collapse.
+
+Every vertex carries the sum of the plane quadrics of its triangles (area
+weighted), plus stiff planes perpendicular to any boundary edge so that
+openings keep their outline. Collapsing edge (a, b) moves a to the point
+that minimizes the summed quadric of a and b, and that point's error is
+the edge's cost.
+
+Collapses run in batches, not one heap pop at a time. Each pass prices
+every edge and takes the cheapest ones as candidates. A candidate is
+dropped if it breaks the link condition (the result would be
+non-manifold) or flips one of its triangles. From the rest, a pass
+collapses each edge that is the cheapest within two rings of its
+endpoints. No triangle touches two of these collapses, so they can all
+be applied at once.
+"""
+
+import numpy as np
+
+BOUNDARY_WEIGHT = 100.0    # boundary planes, relative to the squared edge length
+MIN_NORMAL_DOT = 0.2       # a collapse may not turn any triangle further than this
+
+
+def _planes(V, T):
+    """Unit normals and doubled areas of the triangles."""
+    P = V[T]
+    n = np.cross(P[:, 1] - P[:, 0], P[:, 2] - P[:, 0])
+    area = np.linalg.norm(n, axis=1)
+    ok = area > 0
+    n[ok] /= area[ok, None]
+    return n, area
+
+def _quadrics(V, T, boundary):
+    """Per-vertex 4x4 error quadrics: triangle planes, plus planes along the boundary edges."""
+    n, area = _planes(V, T)
+    p = np.concatenate([n, -np.einsum("ij,ij->i", n, V[T[:, 0]])[:, None]], axis=1)
+    K = (area[:, None, None] * p[:, :, None] * p[:, None, :]).reshape(-1, 16)
+    idx, k = T.ravel(), np.repeat(K, 3, axis=0)
+
+    # Boundary edges (a, b) of triangle t: the plane through the edge along t's normal.
+    a, b, t = boundary
+    if len(t):
+        e = V[b] - V[a]
+        m = np.cross(e, n[t])
+        lm = np.linalg.norm(m, axis=1)
+        ok = lm > 0
+        m[ok] /= lm[ok, None]
+        q = np.concatenate([m, -np.einsum("ij,ij->i", m, V[a])[:, None]], axis=1)
+        w = BOUNDARY_WEIGHT * np.einsum("ij,ij->i", e, e)
+        Kb = (w[:, None, None] * q[:, :, None] * q[:, None, :]).reshape(-1, 16)
+        idx = np.concatenate([idx, a, b])
+        k = np.concatenate([k, Kb, Kb])
+
+    Q = np.stack([np.bincount(idx, k[:, i], minlength=len(V)) for i in range(16)], axis=1)
+    return Q.reshape(-1, 4, 4)
+
+def _edges(T, n):
+    """Undirected edges (a < b), how many triangles share each, and each boundary edge's directed form."""
+    D = np.concatenate([T[:, [0, 1]], T[:, [1, 2]], T[:, [2, 0]]])
+    lo, hi = D.min(axis=1), D.max(axis=1)
+    keys, first, count = np.unique(lo * n + hi, return_index=True, return_counts=True)
+    E = np.stack([keys // n, keys % n], axis=1)
+    once = first[count == 1]
+    boundary = (D[once, 0], D[once, 1], once % len(T))
+    return E, count, boundary
+
+def _error(Q, x):
+    xh = np.concatenate([x, np.ones((len(x), 1))], axis=1)
+    return np.einsum("ei,eij,ej->e", xh, Q, xh)
+
+def _costs(Q, V, E):
+    """Collapse cost and target of every edge: the quadric's minimizer when it is well posed, else the best of a, b and the midpoint."""
+    Qe = Q[E[:, 0]] + Q[E[:, 1]]
+    A, rhs = Qe[:, :3, :3], -Qe[:, :3, 3]
+    a, b = V[E[:, 0]], V[E[:, 1]]
+    choices = [a, b, (a + b) * 0.5]
+    scale = np.abs(A).max(axis=(1, 2))
+    ok = np.abs(np.linalg.det(A)) > 1e-9 * np.maximum(scale, 1e-300) ** 3
+    if ok.any():
+        opt = a.copy()
+        opt[ok] = np.linalg.solve(A[ok], rhs[ok][:, :, None])[:, :, 0]
+        choices.insert(0, opt)
+    err = np.stack([_error(Qe, x) for x in choices], axis=1)
+    if ok.any():
+        err[~ok, 0] = np.inf
+    best = np.argmin(err, axis=1)
+    rows = np.arange(len(E))
+    pos = np.stack(choices, axis=1)[rows, best]
+    return np.maximum(err[rows, best], 0.0), pos
+
+def _csr(keys, n):
+    order = np.argsort(keys, kind="stable")
+    return order, np.searchsorted(keys[order], np.arange(n + 1))
+
+def _expand(start, rows):
+    """For each row r, the positions start[r] .. start[r + 1] - 1, and which row each came from."""
+    lens = start[rows + 1] - start[rows]
+    owner = np.repeat(np.arange(len(rows)), lens)
+    pos = np.arange(lens.sum()) - np.repeat(np.cumsum(lens) - lens, lens) + np.repeat(start[rows], lens)
+    return pos, owner
+
+def _valid(V, T, E, faces, cand, pos, n):
+    """Which candidate collapses keep the mesh manifold and leave every remaining triangle facing the same way."""
+    # Link condition: a and b may share no neighbors beyond the apexes of the edge's own triangles.
+    U = np.concatenate([E, E[:, ::-1]])
+    order, start = _csr(U[:, 0], n)
+    nbr = U[order, 1]
+    keys = np.sort(U[:, 0] * n + U[:, 1])
+    a, b = E[cand, 0], E[cand, 1]
+    at, owner = _expand(start, a)
+    probe = b[owner] * n + nbr[at]
+    hit = keys[np.minimum(np.searchsorted(keys, probe), len(keys) - 1)] == probe
+    ok = np.bincount(owner, hit, minlength=len(cand)) == faces[cand]
+
+    # Fold-over: every triangle around a or b that survives must keep its orientation.
+    order, start = _csr(T.ravel(), n)
+    tri = order // 3
+    ia, oa = _expand(start, a)
+    ib, ob = _expand(start, b)
+    t = np.concatenate([tri[ia], tri[ib]])
+    owner = np.concatenate([oa, ob])
+    C = T[t]
+    moved = (C == a[owner, None]) | (C == b[owner, None])
+    keep = moved.sum(axis=1) == 1
+    t, owner, C, moved = t[keep], owner[keep], C[keep], moved[keep]
+    P0 = V[C]
+    P1 = np.where(moved[:, :, None], pos[owner][:, None, :], P0)
+    n0 = np.cross(P0[:, 1] - P0[:, 0], P0[:, 2] - P0[:, 0])
+    n1 = np.cross(P1[:, 1] - P1[:, 0], P1[:, 2] - P1[:, 0])
+    l0, l1 = np.linalg.norm(n0, axis=1), np.linalg.norm(n1, axis=1)
+    flips = (l0 > 0) & (np.einsum("ij,ij->i", n0, n1) <= MIN_NORMAL_DOT * l0 * l1)
+    ok &= np.bincount(owner, flips, minlength=len(cand)) == 0
+    return ok
+
+def _independent(T, E, rank, n, rounds=4):
+    """
+    Edges no triangle shares with another picked edge. Each round picks the
+    edges whose rank is the lowest within two rings of both endpoints, then
+    rules out everything that shares a triangle with a pick.
+    """
+    none = np.iinfo(np.int64).max
+    rank = rank.copy()
+    picks = []
+    for _ in range(rounds):
+        m1 = np.full(n, none)
+        np.minimum.at(m1, E[:, 0], rank)
+        np.minimum.at(m1, E[:, 1], rank)
+        mt = m1[T].min(axis=1)
+        m2 = np.full(n, none)
+        np.minimum.at(m2, T.ravel(), np.repeat(mt, 3))
+        pick = np.flatnonzero((rank < none) & (m2[E[:, 0]] == rank) & (m2[E[:, 1]] == rank))
+        if not len(pick):
+            break
+        picks.append(pick)
+        hot = np.zeros(n, bool)
+        hot[E[pick].ravel()] = True
+        near = np.zeros(n, bool)
+        near[T[hot[T].any(axis=1)].ravel()] = True
+        rank[near[E[:, 0]] | near[E[:, 1]]] = none
+    return np.concatenate(picks) if picks else np.empty(0, np.int64)
+
+def _compact(V, T):
+    used, T = np.unique(T, return_inverse=True)
+    return (np.ascontiguousarray(V[used], dtype=np.float32),
+            np.ascontiguousarray(T.reshape(-1, 3), dtype=np.uint32))
+
+def simplify(V, T, ratios):
+    """
+    Simplified copies of (V, T) with about ratio * len(T) triangles for each
+    ratio, in the order of `ratios`, as float32 vertices and uint32
+    triangles. Levels are built finest first, each carrying on from the
+    previous one with the same quadrics. A level stops short if no valid
+    collapse is left.
+    """
+    V = np.array(V, dtype=np.float64)
+    T = np.asarray(T, dtype=np.int64)
+    n = len(V)
+    Q = _quadrics(V, T, _edges(T, n)[2])
+    total, out = len(T), [None] * len(ratios)
+    for k in sorted(range(len(ratios)), key=lambda k: -ratios[k]):
+        ratio = ratios[k]
+        target = int(ratio * total)
+        while len(T) > target:
+            E, faces, (ba, bb, _) = _edges(T, n)
+            cost, pos = _costs(Q, V, E)
+            # Non-manifold edges stay put, and so does anything that would pinch two boundary runs together.
+            locked = np.zeros(n, bool)
+            locked[E[faces > 2].ravel()] = True
+            rim = np.zeros(n, bool)
+            rim[ba] = rim[bb] = True
+            bad = locked[E[:, 0]] | locked[E[:, 1]] | ((faces == 2) & rim[E[:, 0]] & rim[E[:, 1]])
+            cost[bad] = np.inf
+
+            # Every edge that is cheapest in its neighborhood is a candidate;
+            # take the cheapest of those, about two triangles per collapse.
+            cand = np.flatnonzero(np.isfinite(cost))
+            cand = cand[_valid(V, T, E, faces, cand, pos[cand], n)]
+            rank = np.full(len(E), np.iinfo(np.int64).max)
+            # Ties (flat regions cost nothing) are broken by a hash of the
+            # edge, not by index, so that equal costs still leave many local
+            # minima rather than one sweep across the mesh.
+            tie = (E[cand, 0] * 2654435761 + E[cand, 1] * 40503) & 0xFFFFFFFF
+            rank[cand[np.lexsort((tie, cost[cand]))]] = np.arange(len(cand))
+            pick = _independent(T, E, rank, n)
+            if not len(pick):
+                break
+            pick = pick[np.argsort(rank[pick])[:max(1, (len(T) - target + 1) // 2)]]
+
+            a, b = E[pick, 0], E[pick, 1]
+            V[a] = pos[pick]
+            Q[a] += Q[b]
+            remap = np.arange(n)
+            remap[b] = a
+            T = remap[T]
+            T = T[(T[:, 0] != T[:, 1]) & (T[:, 1] != T[:, 2]) & (T[:, 2] != T[:, 0])]
+        out[k] = _compact(V, T)
+    return out
@@ -0,0 +1,246 @@
+"""
+NumPy software rasterizer for the fixed-function teapot scene.
+
+Reproduces what teapot.render() asks GL for: model-view and projection
+transforms, per-vertex fixed-function lighting (positional lights,
+non-local viewer, GL_NORMALIZE), GL_FLAT shading from the provoking (last)
+vertex or perspective-correct Gouraud shading, optional back-face culling
+and a GL_LESS depth test. Vertices snap to 1/SUBPIXEL of a pixel and
+coverage uses edge functions at pixel centers with a top-left rule, so
+edges land where GL puts them to within a pixel.
+
+The framebuffer is cut into TILE x TILE tiles, and each tile is one task
+for a process pool. A worker picks out the triangles whose boxes meet its
+tile, expands them to candidate pixels, and keeps the covered fragment
+nearest the eye per pixel. It writes the result straight into a
+framebuffer in shared memory. The per-frame triangle setup reaches the
+workers through shared memory too.
+Triangles with a vertex behind the eye (w <= 0) are dropped instead of
+clipped; the teapot scene never has any.
+"""
+
+import os
+from multiprocessing import Pool, shared_memory
+
+import numpy as np
+
+TILE = 32
+SUBPIXEL = 256
+GLOBAL_AMBIENT = 0.2       # GL_LIGHT_MODEL_AMBIENT default
+
+# Columns of the packed per-triangle setup.
+_XY, _Z, _IW, _RGB, _BOX = slice(0, 6), slice(6, 9), slice(9, 12), slice(12, 21), slice(21, 25)
+_COLUMNS = 25
+# Column order that exchanges the second and third vertex.
+_SWAP_12 = np.r_[0:2, 4:6, 2:4, 6, 8, 7, 9, 11, 10, 12:15, 18:21, 15:18, 21:25]
+
+_attached = {}             # role -> (name, SharedMemory), in worker processes
+
+
+def shade(P, N, lights, material):
+    """
+    Fixed-function lighting of eye-space points P with unit normals N.
+    lights holds (eye-space position, diffuse, specular) per positional light; material
+    is (ambient, diffuse, specular, shininess). Returns clamped RGB.
+    """
+    ambient, diffuse, specular = (np.asarray(m[:3], dtype=np.float64) for m in material[:3])
+    shininess = material[3]
+    color = np.tile(GLOBAL_AMBIENT * ambient, (len(P), 1))
+    for pos, l_diffuse, l_specular in lights:
+        L = np.asarray(pos[:3], dtype=np.float64) - P
+        L /= np.maximum(np.linalg.norm(L, axis=1, keepdims=True), 1e-300)
+        ndl = np.einsum("ij,ij->i", N, L)
+        H = L + (0.0, 0.0, 1.0)
+        H /= np.maximum(np.linalg.norm(H, axis=1, keepdims=True), 1e-300)
+        ndh = np.maximum(np.einsum("ij,ij->i", N, H), 0.0)
+        spec = np.where(ndl > 0, ndh ** shininess, 0.0)
+        color += np.maximum(ndl, 0.0)[:, None] * (diffuse * np.asarray(l_diffuse[:3]))
+        color += spec[:, None] * (specular * np.asarray(l_specular[:3]))
+    return np.clip(color, 0.0, 1.0)
+
+def setup(V, T, N, model_view, projection, size, lights, material, flat=True, cull=False):
+    """
+    Transform, light and snap the triangles, and pack what the tile
+    rasterizer needs into one (n, _COLUMNS) float64 array, in draw order.
+    N holds one normal per triangle when flat, else one per vertex.
+    """
+    width, height = size
+    V = np.asarray(V, dtype=np.float64)
+    T = np.asarray(T, dtype=np.int64)
+    N = np.asarray(N, dtype=np.float64)
+    mv = np.asarray(model_view, dtype=np.float64)
+    R = mv[:3, :3]
+    eye = V @ R.T + mv[:3, 3]
+    # GL transforms normals by the inverse transpose; GL_NORMALIZE renormalizes.
+    n_eye = N @ np.linalg.inv(R)
+    n_eye /= np.maximum(np.linalg.norm(n_eye, axis=1, keepdims=True), 1e-300)
+    if flat:
+        rgb = np.repeat(shade(eye[T[:, 2]], n_eye, lights, material), 3, axis=0).reshape(-1, 9)
+    else:
+        rgb = shade(eye, n_eye, lights, material)[T].reshape(-1, 9)
+
+    clip = np.concatenate([eye, np.ones((len(V), 1))], axis=1) @ np.asarray(projection, dtype=np.float64).T
+    w = clip[T, 3]
+    keep = np.all(w > 0, axis=1)
+    T, w, rgb = T[keep], w[keep], rgb[keep]
+    ndc = clip[T, :3] / w[:, :, None]
+    x = np.round((ndc[:, :, 0] + 1.0) * 0.5 * width * SUBPIXEL) / SUBPIXEL
+    y = np.round((ndc[:, :, 1] + 1.0) * 0.5 * height * SUBPIXEL) / SUBPIXEL
+    z = (ndc[:, :, 2] + 1.0) * 0.5
+
+    area = (x[:, 1] - x[:, 0]) * (y[:, 2] - y[:, 0]) - (x[:, 2] - x[:, 0]) * (y[:, 1] - y[:, 0])
+    keep = area > 0 if cull else area != 0
+    # Pixel centers sit at i + 0.5; the box is the inclusive range of centers it can cover.
+    lo_x = np.ceil(x.min(axis=1) - 0.5)
+    hi_x = np.floor(x.max(axis=1) - 0.5)
+    lo_y = np.ceil(y.min(axis=1) - 0.5)
+    hi_y = np.floor(y.max(axis=1) - 0.5)
+    keep &= (hi_x >= 0) & (lo_x < width) & (hi_y >= 0) & (lo_y < height) & (lo_x <= hi_x) & (lo_y <= hi_y)
+    keep &= (z.min(axis=1) <= 1.0) & (z.max(axis=1) >= 0.0)
+
+    packed = np.empty((int(keep.sum()), _COLUMNS))
+    packed[:, _XY] = np.stack([x[keep], y[keep]], axis=2).reshape(-1, 6)
+    packed[:, _Z] = z[keep]
+    packed[:, _IW] = 1.0 / w[keep]
+    packed[:, _RGB] = rgb[keep]
+    packed[:, _BOX] = np.stack([np.maximum(lo_x[keep], 0), np.minimum(hi_x[keep], width - 1),
+                                np.maximum(lo_y[keep], 0), np.minimum(hi_y[keep], height - 1)], axis=1)
+    # Wind everything counter-clockwise so one inside test serves both facings.
+    cw = area[keep] < 0
+    packed[cw] = packed[cw][:, _SWAP_12]
+    return packed
+
+def _tile(fb, tris, x0, x1, y0, y1, flat):
+    """
+    Rasterize the packed, counter-clockwise triangles whose boxes meet
+    fb[y0:y1, x0:x1] (window rows, bottom up) into it. Every triangle
+    expands to the pixel centers of its box inside the tile; edge functions
+    keep the covered ones, and a depth sort per pixel stands in for the
+    tile's z-buffer.
+    """
+    box = tris[:, _BOX]
+    sel = np.flatnonzero((box[:, 0] < x1) & (box[:, 1] >= x0) & (box[:, 2] < y1) & (box[:, 3] >= y0))
+    if not len(sel):
+        return
+    bx = np.maximum(box[sel, 0], x0).astype(np.int64)
+    by = np.maximum(box[sel, 2], y0).astype(np.int64)
+    w = np.minimum(box[sel, 1], x1 - 1).astype(np.int64) - bx + 1
+    n = w * (np.minimum(box[sel, 3], y1 - 1).astype(np.int64) - by + 1)
+    frag = np.repeat(np.arange(len(sel)), n)
+    k = np.arange(n.sum()) - np.repeat(np.cumsum(n) - n, n)
+    px = bx[frag] + k % w[frag]
+    py = by[frag] + k // w[frag]
+    tri = sel[frag]
+    t = tris[tri]
+    X, Y = t[:, 0:6:2], t[:, 1:6:2]
+    cx, cy = px + 0.5, py + 0.5
+
+    inside = np.ones(len(t), bool)
+    lam = np.empty((len(t), 3))
+    for i in range(3):
+        # Edge i runs from vertex i+1 to vertex i+2 and is zero on it; the
+        # interior is on its left. Centers exactly on an edge belong to the
+        # triangle only for left edges and top edges.
+        ax, ay = X[:, (i + 1) % 3], Y[:, (i + 1) % 3]
+        dx, dy = X[:, (i + 2) % 3] - ax, Y[:, (i + 2) % 3] - ay
+        e = dx * (cy - ay) - dy * (cx - ax)
+        inside &= (e > 0) | ((e == 0) & ((dy < 0) | ((dy == 0) & (dx < 0))))
+        lam[:, i] = e
+    # Screen-space barycentrics: window z is affine in them.
+    lam /= lam.sum(axis=1, keepdims=True)
+    z = np.einsum("ij,ij->i", lam, t[:, _Z])
+    inside &= z >= 0.0
+    inside &= z < 1.0
+    lam, t, tri, z = lam[inside], t[inside], tri[inside], z[inside]
+    pixel = (py[inside] - y0) * (x1 - x0) + (px[inside] - x0)
+    if not len(pixel):
+        return
+
+    # GL_LESS: nearest fragment per pixel, and the first drawn on a tie.
+    order = np.lexsort((tri, z, pixel))
+    first = order[np.r_[True, pixel[order][1:] != pixel[order][:-1]]]
+    t, pixel = t[first], pixel[first]
+    if flat:
+        rgb = t[:, 18:21]
+    else:
+        lam = lam[first] * t[:, _IW]
+        lam /= lam.sum(axis=1, keepdims=True)
+        rgb = np.einsum("ij,ijk->ik", lam, t[:, _RGB].reshape(-1, 3, 3))
+    rows, cols = np.divmod(pixel, x1 - x0)
+    fb[y0 + rows, x0 + cols] = np.floor(np.clip(rgb, 0.0, 1.0) * 255.0 + 0.5).astype(np.uint8)
+
+def _attach(role, name, shape, dtype):
+    """A worker's view of the parent's shared array, reopened only when the parent reallocates it."""
+    held = _attached.get(role)
+    if held is None or held[0] != name:
+        if held is not None:
+            held[1].close()
+        held = _attached[role] = (name, shared_memory.SharedMemory(name=name))
+    return np.ndarray(shape, dtype=dtype, buffer=held[1].buf)
+
+def _tile_task(args):
+    fb_spec, tri_spec, x0, x1, y0, y1, flat = args
+    _tile(_attach("fb", *fb_spec), _attach("tris", *tri_spec), x0, x1, y0, y1, flat)
+
+
+class SoftRenderer:
+    def __init__(self, width, height, workers=None, tile=TILE):
+        """
+        A width x height RGB framebuffer and, with more than one worker, a
+        process pool that shares it. workers defaults to the CPU count.
+        """
+        self.width, self.height, self.tile = width, height, tile
+        self.workers = workers or os.cpu_count() or 1
+        self.pool = None
+        self._fb_shm = self._tri_shm = None
+        if self.workers > 1:
+            self._fb_shm = shared_memory.SharedMemory(create=True, size=width * height * 3)
+            self.fb = np.ndarray((height, width, 3), np.uint8, buffer=self._fb_shm.buf)
+            self.pool = Pool(self.workers)
+        else:
+            self.fb = np.zeros((height, width, 3), np.uint8)
+
+    def _share(self, tris):
+        """Copy the packed triangles into shared memory, growing the block when they outgrow it."""
+        if self._tri_shm is None or self._tri_shm.size < max(tris.nbytes, 1):
+            if self._tri_shm is not None:
+                self._tri_shm.close()
+                self._tri_shm.unlink()
+            self._tri_shm = shared_memory.SharedMemory(create=True, size=max(tris.nbytes * 2, 4096))
+        np.ndarray(tris.shape, tris.dtype, buffer=self._tri_shm.buf)[:] = tris
+        return self._tri_shm.name, tris.shape, tris.dtype.str
+
+    def render(self, V, T, N, model_view, projection, lights, material, flat=True, cull=False,
+               clear=(0, 0, 0)):
+        """The frame as a (height, width, 3) uint8 array, top row first like headless.read_rgb."""
+        tris = setup(V, T, N, model_view, projection, (self.width, self.height),
+                     lights, material, flat, cull)
+        self.fb[:] = clear
+        tiles = [(x0, min(x0 + self.tile, self.width), y0, min(y0 + self.tile, self.height))
+                 for y0 in range(0, self.height, self.tile) for x0 in range(0, self.width, self.tile)]
+        if self.pool is None:
+            for tile in tiles:
+                _tile(self.fb, tris, *tile, flat)
+        else:
+            fb_spec = (self._fb_shm.name, self.fb.shape, self.fb.dtype.str)
+            tri_spec = self._share(tris)
+            self.pool.map(_tile_task, [(fb_spec, tri_spec) + tile + (flat,) for tile in tiles])
+        return self.fb[::-1].copy()
+
+    def close(self):
+        if self.pool is not None:
+            self.pool.close()
+            self.pool.join()
+            self.pool = None
+        self.fb = None
+        for shm in (self._tri_shm, self._fb_shm):
+            if shm is not None:
+                shm.close()
+                shm.unlink()
+        self._tri_shm = self._fb_shm = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
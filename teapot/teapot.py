@@ -1,149 +1,451 @@
-from OpenGL.GL import *
-from OpenGL.GLUT import *
-from OpenGL.GLU import *
-import numpy as np
-import math
-import sys
-
-angle = 0.0 
-tilt_deg = 22.0
-vertices = []        
-triangles = []             
-normals = []               
-ZUP_TO_YUP = True           
-
-def load_obj(path: str):
-    global vertices, triangles
-    raw_vertices = []
-    triangles.clear()
-
-    with open(path, "r") as f:
-        for line in f:
-            s = line.strip()
-            if not s or s.startswith("#"):
-                continue
-            if s.startswith("v "):
-                _, x, y, z = s.split()[:4]
-                raw_vertices.append([float(x), float(y), float(z)])
-            elif s.startswith("f "):
-                parts = s.split()[1:]
-                ids = []
-                for p in parts:
-                    v = p.split("/")[0]
-                    if not v:
-                        continue
-                    vi = int(v)
-                    if vi < 0:  
-                        vi = len(raw_vertices) + vi + 1
-                    ids.append(vi - 1)  
-                for j in range(1, len(ids) - 1):
-                    triangles.append([ids[0], ids[j], ids[j + 1]])
-
-    if not raw_vertices or not triangles:
-        raise RuntimeError("Failed to load teapot.obj (no vertices/faces found).")
-
-    V = np.array(raw_vertices, dtype=np.float32)
-    vmin, vmax = V.min(axis=0), V.max(axis=0)
-    center = (vmin + vmax) * 0.5
-    extent = float((vmax - vmin).max())
-    scale = 2.0 / extent if extent > 1e-8 else 1.0
-    vertices[:] = ((V - center) * scale).tolist()
-
-def compute_normals():
-    normals.clear()
-    for a, b, c in triangles:
-        v1 = np.array(vertices[a], dtype=np.float32)
-        v2 = np.array(vertices[b], dtype=np.float32)
-        v3 = np.array(vertices[c], dtype=np.float32)
-        n = np.cross(v2 - v1, v3 - v1)
-        ln = float(np.linalg.norm(n))
-        normals.append((n / ln) if ln > 1e-12 else np.array([0.0, 1.0, 0.0], dtype=np.float32))
-
-def init_lighting():
-    glEnable(GL_LIGHTING)
-    glEnable(GL_LIGHT0)       
-    glEnable(GL_LIGHT1)              
-    glEnable(GL_DEPTH_TEST)
-    glEnable(GL_NORMALIZE)           
-    glShadeModel(GL_FLAT)           
-
-    glLightfv(GL_LIGHT0, GL_DIFFUSE,  (0.0, 0.0, 1.0, 1.0))  
-    glLightfv(GL_LIGHT1, GL_DIFFUSE,  (1.0, 0.0, 0.0, 1.0))  
-    glLightfv(GL_LIGHT0, GL_SPECULAR, (0.0, 0.0, 1.0, 1.0))
-    glLightfv(GL_LIGHT1, GL_SPECULAR, (1.0, 0.0, 0.0, 1.0))
-
-def init_material():
-    glMaterialfv(GL_FRONT, GL_AMBIENT_AND_DIFFUSE, (0.70, 0.70, 0.70, 1.0))
-    glMaterialfv(GL_FRONT, GL_SPECULAR, (0.30, 0.30, 0.30, 1.0))
-    glMaterialf(GL_FRONT, GL_SHININESS, 32.0)
-
-def display():
-    global angle
-    glClear(GL_COLOR_BUFFER_BIT | GL_DEPTH_BUFFER_BIT)
-    glLoadIdentity()
-
-    # Camera
-    gluLookAt(0.0, 0.10, 3.5,   0.0, 0.0, 0.0,   0.0, 1.0, 0.0)
-
-    # Lights (camera-relative)
-    glLightfv(GL_LIGHT0, GL_POSITION, ( 3.0,  5.0, 5.0, 1.0))   # blue: up-left
-    glLightfv(GL_LIGHT1, GL_POSITION, (-3.0, -2.5, 3.0, 1.0))   # red: down-right
-
-    glPushMatrix()
-
-    # Fixed tilt toward the viewer (world X) — stays constant as it spins
-    glRotatef(tilt_deg, 1.0, 0.0, 0.0)
-
-    # Turntable spin about WORLD Y
-    glRotatef(angle, 0.0, 1.0, 0.0)
-
-    # Reorient OBJ if it's Z-up (closest to the model)
-    if ZUP_TO_YUP:
-        glRotatef(-90.0, 1.0, 0.0, 0.0)   # use +90.0 if this flips it
-
-    #
-    
-
-    glBegin(GL_TRIANGLES)
-    for (a, b, c), n in zip(triangles, normals):
-        glNormal3fv(n)
-        glVertex3fv(vertices[a])
-        glVertex3fv(vertices[b])
-        glVertex3fv(vertices[c])
-    glEnd()
-
-    glPopMatrix()
-    glutSwapBuffers()
-
-    angle = (angle + 5.0) % 360.0
-
-def reshape(w, h):
-    if h == 0: h = 1
-    glViewport(0, 0, w, h)
-    glMatrixMode(GL_PROJECTION)
-    glLoadIdentity()
-    gluPerspective(45.0, float(w) / float(h), 0.1, 100.0)
-    glMatrixMode(GL_MODELVIEW)
-
-def timer(_):
-    glutPostRedisplay()
-    glutTimerFunc(16, timer, 0)  
-
-def main():
-    load_obj("teapot.obj")
-    compute_normals()
-
-    glutInit()
-    glutInitDisplayMode(GLUT_DOUBLE | GLUT_RGB | GLUT_DEPTH)
-    glutInitWindowSize(800, 600)
-    glutCreateWindow(b"Lighting Teapot - Amin Aden")
-
-    init_lighting()
-    init_material()
-    glutDisplayFunc(display)
-    glutReshapeFunc(reshape)
-    glutTimerFunc(0, timer, 0)
-    glutMainLoop()
-
-if __name__ == "__main__":
-    main()
+import numpy as np
+import argparse
+import math
+import os
+import sys
+
+if __name__ == "__main__":
+    # Run as a script from teapot/: frameprof, objfile and lazyload sit with
+    # the other scene scripts one directory up. Importers (headless.py,
+    # turntable.py, benchmarks) put that directory on sys.path themselves.
+    sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import frameprof
+import objfile
+# The loader and normal kernels only need NumPy; load_gl binds the
+# GL/GLU/GLUT names into this module the first time something draws.
+from lazyload import load_gl
+
+angle = 0.0 
+tilt_deg = 22.0
+vertices = []        
+triangles = []             
+normals = []               
+ZUP_TO_YUP = True           
+SMOOTH_NORMALS = False     # per-vertex normals + GL_SMOOTH instead of per-face + GL_FLAT
+RENDERER = "vbo"           # "vbo", "arrays" (client-side vertex arrays) or "immediate"
+CULL = "auto"              # meshlet culling: "auto" (back faces only on closed meshes), "full" or "off"
+OPTIMIZE = True            # weld vertices and reorder triangles for the vertex cache on load
+mesh_report = None         # meshopt's vertex counts and ACMR for the last load_obj
+mesh = None
+clusters = None            # Meshlets over the (reordered) triangles, when culling
+submitted = 0              # triangles sent to GL in the last frame
+LOD = "auto"               # level of detail: "auto" (by projected size), "off", or a level index
+LOD_RATIOS = (0.5, 0.25, 0.1)
+PIXELS_PER_TRIANGLE = 8.0  # auto LOD: the coarsest level with a triangle per this many covered pixels
+lods = []                  # (vertices, triangles) per level, finest first, once load_lods has run
+levels = []                # [vertices, triangles, normals, mesh, clusters] per level, from build_mesh
+level = 0
+radius = 1.0               # bounding sphere of the model about the origin
+
+EYE = (0.0, 0.10, 3.5)
+# Positional lights set right after gluLookAt (so fixed relative to the
+# camera) as (position, diffuse = specular color), and the front material.
+LIGHTS = (((3.0, 5.0, 5.0, 1.0), (0.0, 0.0, 1.0, 1.0)),     # blue: up-left
+          ((-3.0, -2.5, 3.0, 1.0), (1.0, 0.0, 0.0, 1.0)))   # red: down-right
+MATERIAL = ((0.70, 0.70, 0.70, 1.0), (0.30, 0.30, 0.30, 1.0), 32.0)  # ambient/diffuse, specular, shininess
+FOV_Y, Z_NEAR, Z_FAR = 45.0, 0.1, 100.0
+aspect = 800.0 / 600.0
+viewport = (800, 600)
+
+_CACHE_SUFFIX = ".meshcache.npz"
+_LOD_SUFFIX = ".lodcache.npz"
+
+def _parse_obj(path):
+    V, ids, counts = objfile.read_polygons(path)
+    return V, objfile.triangulate(ids, counts)
+
+def _cache_path(path):
+    return path + _CACHE_SUFFIX
+
+def _read_cache(path):
+    st = os.stat(path)
+    try:
+        with np.load(_cache_path(path)) as z:
+            if (int(z["mtime_ns"]) != st.st_mtime_ns or int(z["size"]) != st.st_size
+                    or bool(z["optimized"]) != OPTIMIZE):
+                return None
+            report = None
+            if OPTIMIZE:
+                report = {"vertices": tuple(z["report_vertices"].tolist()),
+                          "acmr": tuple(z["report_acmr"].tolist())}
+            return z["vertices"], z["triangles"], report
+    except (OSError, KeyError, ValueError):
+        return None
+
+def _write_cache(path, V, T, report):
+    st = os.stat(path)
+    extra = {}
+    if report is not None:
+        extra = {"report_vertices": report["vertices"], "report_acmr": report["acmr"]}
+    try:
+        np.savez(_cache_path(path), vertices=V, triangles=T, optimized=OPTIMIZE,
+                 mtime_ns=st.st_mtime_ns, size=st.st_size, **extra)
+    except OSError:
+        pass
+
+def load_obj(path: str, use_cache=True):
+    global vertices, triangles, lods, mesh_report
+    lods = []
+    cached = _read_cache(path) if use_cache else None
+    if cached is not None:
+        vertices, triangles, mesh_report = cached
+        return
+
+    V, T = _parse_obj(path)
+    if not len(V) or not len(T):
+        raise RuntimeError(f"Failed to load {path} (no vertices/faces found).")
+    if T.min() < 0 or T.max() >= len(V):
+        raise RuntimeError(f"{path}: face index out of range.")
+
+    vmin, vmax = V.min(axis=0), V.max(axis=0)
+    center = (vmin + vmax) * 0.5
+    extent = float((vmax - vmin).max())
+    scale = 2.0 / extent if extent > 1e-8 else 1.0
+    vertices = np.ascontiguousarray((V - center) * scale, dtype=np.float32)
+    triangles = np.ascontiguousarray(T, dtype=np.uint32)
+    mesh_report = None
+    if OPTIMIZE:
+        from meshopt import optimize
+        vertices, triangles, mesh_report = optimize(vertices, triangles)
+    if use_cache:
+        _write_cache(path, vertices, triangles, mesh_report)
+
+def _read_lods(path):
+    st = os.stat(path)
+    try:
+        with np.load(path + _LOD_SUFFIX) as z:
+            if (int(z["mtime_ns"]) != st.st_mtime_ns or int(z["size"]) != st.st_size
+                    or not np.array_equal(z["ratios"], LOD_RATIOS) or bool(z["optimized"]) != OPTIMIZE):
+                return None
+            return [(z[f"vertices{i}"], z[f"triangles{i}"]) for i in range(len(LOD_RATIOS))]
+    except (OSError, KeyError, ValueError):
+        return None
+
+def _write_lods(path, simplified):
+    st = os.stat(path)
+    arrays = {}
+    for i, (V, T) in enumerate(simplified):
+        arrays[f"vertices{i}"], arrays[f"triangles{i}"] = V, T
+    try:
+        np.savez(path + _LOD_SUFFIX, ratios=np.asarray(LOD_RATIOS), optimized=OPTIMIZE,
+                 mtime_ns=st.st_mtime_ns, size=st.st_size, **arrays)
+    except OSError:
+        pass
+
+def load_lods(path: str, use_cache=True):
+    """
+    Simplify the mesh load_obj just read to each of LOD_RATIOS of its
+    triangles. The results are cached next to the model, keyed like the
+    mesh cache.
+    """
+    global lods
+    simplified = _read_lods(path) if use_cache else None
+    if simplified is None:
+        from simplify import simplify
+        simplified = simplify(vertices, triangles, LOD_RATIOS)
+        if OPTIMIZE:
+            from meshopt import optimize
+            simplified = [optimize(V, T)[:2] for V, T in simplified]
+        if use_cache:
+            _write_lods(path, simplified)
+    lods = [(vertices, triangles)] + list(simplified)
+
+def face_normals(V, T):
+    V = np.asarray(V, dtype=np.float32)
+    T = np.asarray(T, dtype=np.intp)
+    v1 = V[T[:, 0]]
+    n = np.cross(V[T[:, 1]] - v1, V[T[:, 2]] - v1)
+    ln = np.linalg.norm(n, axis=1)
+    ok = ln > 1e-12
+    out = np.empty_like(n)
+    out[ok] = n[ok] / ln[ok, None]
+    out[~ok] = (0.0, 1.0, 0.0)
+    return out
+
+def vertex_normals(V, T):
+    # The unnormalized cross product is twice the triangle area, so summing it
+    # per corner gives area-weighted vertex normals.
+    V = np.asarray(V, dtype=np.float32)
+    T = np.asarray(T, dtype=np.intp)
+    v1 = V[T[:, 0]]
+    n = np.cross(V[T[:, 1]] - v1, V[T[:, 2]] - v1).astype(np.float64)
+    idx = T.ravel()
+    acc = np.stack([np.bincount(idx, np.repeat(n[:, k], 3), minlength=len(V))
+                    for k in range(3)], axis=1)
+    ln = np.linalg.norm(acc, axis=1)
+    ok = ln > 1e-12
+    acc[ok] /= ln[ok, None]
+    acc[~ok] = (0.0, 1.0, 0.0)
+    return acc.astype(np.float32)
+
+def compute_normals():
+    global normals
+    if SMOOTH_NORMALS:
+        normals = vertex_normals(vertices, triangles)
+    else:
+        normals = face_normals(vertices, triangles)
+
+def init_lighting():
+    load_gl(globals(), glut=True)
+    glEnable(GL_LIGHTING)
+    glEnable(GL_LIGHT0)       
+    glEnable(GL_LIGHT1)              
+    glEnable(GL_DEPTH_TEST)
+    glEnable(GL_NORMALIZE)           
+    glShadeModel(GL_SMOOTH if SMOOTH_NORMALS else GL_FLAT)
+
+    for i, (_, color) in enumerate(LIGHTS):
+        glLightfv(GL_LIGHT0 + i, GL_DIFFUSE, color)
+        glLightfv(GL_LIGHT0 + i, GL_SPECULAR, color)
+
+def init_material():
+    ambient_diffuse, specular, shininess = MATERIAL
+    glMaterialfv(GL_FRONT, GL_AMBIENT_AND_DIFFUSE, ambient_diffuse)
+    glMaterialfv(GL_FRONT, GL_SPECULAR, specular)
+    glMaterialf(GL_FRONT, GL_SHININESS, shininess)
+
+def select_lod():
+    """
+    Switch to the level for the current view. In auto mode that is the
+    coarsest level that still has a triangle for every PIXELS_PER_TRIANGLE
+    pixels of the model's projected bounding disc.
+    """
+    if LOD == "auto":
+        d = math.sqrt(sum(c * c for c in EYE))
+        r = radius / (d * math.tan(math.radians(FOV_Y) * 0.5)) * viewport[1] * 0.5
+        need = math.pi * r * r / PIXELS_PER_TRIANGLE
+        i = len(levels) - 1
+        while i > 0 and len(levels[i][1]) < need:
+            i -= 1
+    elif LOD == "off":
+        i = 0
+    else:
+        i = min(int(LOD), len(levels) - 1)
+    if i != level:
+        use_lod(i)
+
+@frameprof.timed("display")
+def display():
+    global angle
+    select_lod()
+    render()
+    glutSwapBuffers()
+    angle = (angle + 5.0) % 360.0
+    frameprof.frame()
+
+@frameprof.timed("render")
+def render():
+    glClear(GL_COLOR_BUFFER_BIT | GL_DEPTH_BUFFER_BIT)
+    glLoadIdentity()
+
+    # Camera
+    gluLookAt(*EYE,   0.0, 0.0, 0.0,   0.0, 1.0, 0.0)
+
+    # Lights (camera-relative)
+    for i, (position, _) in enumerate(LIGHTS):
+        glLightfv(GL_LIGHT0 + i, GL_POSITION, position)
+
+    glPushMatrix()
+
+    # Fixed tilt toward the viewer (world X) — stays constant as it spins
+    glRotatef(tilt_deg, 1.0, 0.0, 0.0)
+
+    # Turntable spin about WORLD Y
+    glRotatef(angle, 0.0, 1.0, 0.0)
+
+    # Reorient OBJ if it's Z-up (closest to the model)
+    if ZUP_TO_YUP:
+        glRotatef(-90.0, 1.0, 0.0, 0.0)   # use +90.0 if this flips it
+
+    ranges = visible_ranges()
+    if mesh is not None:
+        mesh.draw(ranges)
+    else:
+        draw_immediate(ranges)
+
+    glPopMatrix()
+
+def _rotation(deg, x, y, z):
+    """glRotatef's matrix, row-major."""
+    c, s = math.cos(math.radians(deg)), math.sin(math.radians(deg))
+    x, y, z = np.array([x, y, z], dtype=np.float64) / math.sqrt(x*x + y*y + z*z)
+    M = np.eye(4)
+    M[:3, :3] = [[x*x*(1-c) + c,   x*y*(1-c) - z*s, x*z*(1-c) + y*s],
+                 [y*x*(1-c) + z*s, y*y*(1-c) + c,   y*z*(1-c) - x*s],
+                 [z*x*(1-c) - y*s, z*y*(1-c) + x*s, z*z*(1-c) + c]]
+    return M
+
+def _look_at(eye, center, up):
+    f = np.subtract(center, eye, dtype=np.float64); f /= np.linalg.norm(f)
+    side = np.cross(f, up); side /= np.linalg.norm(side)
+    u = np.cross(side, f)
+    M = np.eye(4)
+    M[0, :3], M[1, :3], M[2, :3] = side, u, -f
+    M[:3, 3] = -M[:3, :3] @ eye
+    return M
+
+def _perspective(fovy, aspect, near, far):
+    f = 1.0 / math.tan(math.radians(fovy) * 0.5)
+    return np.array([[f / aspect, 0, 0, 0],
+                     [0, f, 0, 0],
+                     [0, 0, (far + near) / (near - far), 2 * far * near / (near - far)],
+                     [0, 0, -1, 0]])
+
+def model_view():
+    """The object-to-eye matrix render() builds with gluLookAt and glRotatef, row-major."""
+    M = _look_at(EYE, (0.0, 0.0, 0.0), (0.0, 1.0, 0.0))
+    M = M @ _rotation(tilt_deg, 1.0, 0.0, 0.0) @ _rotation(angle, 0.0, 1.0, 0.0)
+    if ZUP_TO_YUP:
+        M = M @ _rotation(-90.0, 1.0, 0.0, 0.0)
+    return M
+
+@frameprof.timed("cull")
+def visible_ranges():
+    """(first, count) triangle runs that survive meshlet culling this frame; None draws everything."""
+    global submitted
+    if clusters is None:
+        submitted = len(triangles)
+        return None
+    mv = model_view()
+    eye = np.linalg.inv(mv)[:3, 3]
+    runs = clusters.runs(clusters.visible(_perspective(FOV_Y, aspect, Z_NEAR, Z_FAR) @ mv, eye))
+    submitted = sum(count for _, count in runs)
+    return runs
+
+def render_cpu(renderer):
+    """
+    The frame render() would draw, from softraster instead of GL, as a
+    (height, width, 3) uint8 array. renderer is a softraster.SoftRenderer;
+    no GL context is needed.
+    """
+    view = _look_at(EYE, (0.0, 0.0, 0.0), (0.0, 1.0, 0.0))
+    lights = [(view @ position, color, color) for position, color in LIGHTS]
+    ambient_diffuse, specular, shininess = MATERIAL
+    material = (ambient_diffuse, ambient_diffuse, specular, shininess)
+    projection = _perspective(FOV_Y, renderer.width / renderer.height, Z_NEAR, Z_FAR)
+    return renderer.render(vertices, triangles, normals, model_view(), projection, lights, material,
+                           flat=not SMOOTH_NORMALS, cull=clusters is not None and clusters.backface)
+
+def draw_immediate(ranges=None):
+    if ranges is None:
+        ranges = [(0, len(triangles))]
+    glBegin(GL_TRIANGLES)
+    for first, count in ranges:
+        tris = triangles[first:first + count]
+        if SMOOTH_NORMALS:
+            for a, b, c in tris:
+                glNormal3fv(normals[a]); glVertex3fv(vertices[a])
+                glNormal3fv(normals[b]); glVertex3fv(vertices[b])
+                glNormal3fv(normals[c]); glVertex3fv(vertices[c])
+        else:
+            for (a, b, c), n in zip(tris, normals[first:first + count]):
+                glNormal3fv(n)
+                glVertex3fv(vertices[a])
+                glVertex3fv(vertices[b])
+                glVertex3fv(vertices[c])
+    glEnd()
+
+def build_clusters():
+    """Group the triangles into meshlets and reorder them (and flat normals) to match."""
+    global clusters, triangles, normals
+    clusters = None
+    if CULL == "off":
+        return
+    from meshlets import Meshlets
+    clusters = Meshlets(vertices, triangles, backface=True if CULL == "full" else None)
+    triangles = triangles[clusters.order]
+    if not SMOOTH_NORMALS:
+        normals = normals[clusters.order]
+
+def build_mesh():
+    """Meshlets and a GL mesh for every LOD (just the loaded mesh before load_lods); shows the finest."""
+    global vertices, triangles, mesh, levels, radius
+    for lv in levels:
+        if lv[3] is not None:
+            lv[3].delete()
+    levels = []
+    for V, T in lods or [(vertices, triangles)]:
+        vertices, triangles = V, T
+        if lods:
+            compute_normals()
+        build_clusters()
+        mesh = None
+        if RENDERER != "immediate":
+            from glmesh import GLMesh
+            mesh = GLMesh(vertices, normals, triangles, flat=not SMOOTH_NORMALS,
+                          use_vbo=RENDERER == "vbo")
+        levels.append([vertices, triangles, normals, mesh, clusters])
+    radius = float(np.linalg.norm(levels[0][0], axis=1).max())
+    use_lod(0)
+
+def use_lod(i):
+    """Make level i the one render() draws."""
+    global level, vertices, triangles, normals, mesh, clusters
+    level = i
+    vertices, triangles, normals, mesh, clusters = levels[i]
+    # Whole back-facing meshlets are already gone; GL drops the rest.
+    if clusters is not None and clusters.backface:
+        glEnable(GL_CULL_FACE)
+    else:
+        glDisable(GL_CULL_FACE)
+
+def reshape(w, h):
+    global aspect, viewport
+    load_gl(globals(), glut=True)
+    if h == 0: h = 1
+    aspect = float(w) / float(h)
+    viewport = (w, h)
+    glViewport(0, 0, w, h)
+    glMatrixMode(GL_PROJECTION)
+    glLoadIdentity()
+    gluPerspective(FOV_Y, aspect, Z_NEAR, Z_FAR)
+    glMatrixMode(GL_MODELVIEW)
+
+def timer(_):
+    glutPostRedisplay()
+    glutTimerFunc(16, timer, 0)  
+
+def parse_args(argv=None):
+    global RENDERER, SMOOTH_NORMALS, CULL, LOD, OPTIMIZE
+    ap = argparse.ArgumentParser(description="Lighting teapot turntable")
+    ap.add_argument("--renderer", choices=("vbo", "arrays", "immediate"), default=RENDERER)
+    ap.add_argument("--smooth", action="store_true", default=SMOOTH_NORMALS)
+    ap.add_argument("--cull", choices=("auto", "full", "off"), default=CULL)
+    ap.add_argument("--lod", default=LOD,
+                    choices=("auto", "off") + tuple(map(str, range(len(LOD_RATIOS) + 1))))
+    ap.add_argument("--no-optimize", dest="optimize", action="store_false", default=OPTIMIZE,
+                    help="keep OBJ vertex and triangle order as written")
+    ap.add_argument("--report", action="store_true",
+                    help="print welded vertex counts and ACMR after loading")
+    args, _ = ap.parse_known_args(argv)
+    RENDERER, SMOOTH_NORMALS, CULL, LOD = args.renderer, args.smooth, args.cull, args.lod
+    OPTIMIZE = args.optimize
+    return args
+
+def main():
+    args = parse_args()
+    load_obj("teapot.obj")
+    if args.report and mesh_report is not None:
+        (n0, n1), (a0, a1) = mesh_report["vertices"], mesh_report["acmr"]
+        print(f"teapot.obj: {len(triangles)} triangles, {n0} -> {n1} vertices, "
+              f"ACMR {a0:.3f} -> {a1:.3f}")
+    if LOD != "off":
+        load_lods("teapot.obj")
+    compute_normals()
+
+    load_gl(globals(), glut=True)
+    glutInit()
+    glutInitDisplayMode(GLUT_DOUBLE | GLUT_RGB | GLUT_DEPTH)
+    glutInitWindowSize(800, 600)
+    glutCreateWindow(b"Lighting Teapot - Amin Aden")
+
+    init_lighting()
+    init_material()
+    build_mesh()
+    glutDisplayFunc(display)
+    glutReshapeFunc(reshape)
+    glutTimerFunc(0, timer, 0)
+    glutMainLoop()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,263 @@
+#!/usr/bin/env python3
+"""
+Offscreen turntable export for OBJ models, drawn the way teapot.py draws.
+
+Each model is rendered at --frames evenly spaced angles into
+OUT/<its path below the models' common folder>/frame_NNNN; two models
+that map to one folder are an error. Frames are read
+back through a ring of pixel buffer objects: glReadPixels into one PBO
+returns at once, and the frame read RING - 1 frames earlier is mapped and
+copied out. The copy therefore overlaps the draws that follow it. PNG or
+raw RGB encoding runs on a thread pool, since zlib and file writes
+release the GIL. At most --queue frames are read back but not yet
+written, so memory stays flat however long the sequence is. Independent
+models spread across a process pool, and each process has its own EGL
+context. One JSON record per model goes to stdout, with frames per
+second and the process's peak RSS; the totals go to stderr. Options
+after the known ones go to teapot.parse_args (--renderer, --smooth,
+--cull).
+
+    python turntable.py teapot/teapot.obj --frames 72 --out frames
+    python turntable.py --list models.txt --procs 4 --encoders 2 --format raw
+"""
+
+import argparse
+import ctypes
+import json
+import os
+import resource
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from multiprocessing import Pool
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+TEAPOT_DIR = os.path.join(ROOT, "teapot")
+RING = 3
+
+_context = None            # this process's OffscreenContext
+
+
+class PBOReader:
+    """Asynchronous glReadPixels through a ring of GL_PIXEL_PACK_BUFFERs."""
+
+    def __init__(self, width, height, ring=RING):
+        from OpenGL.GL import (GL_PACK_ALIGNMENT, GL_PIXEL_PACK_BUFFER, GL_STREAM_READ,
+                               glBindBuffer, glBufferData, glGenBuffers, glPixelStorei)
+        self.width, self.height, self.ring = width, height, ring
+        self.nbytes = width * height * 3
+        self.pbos = list(glGenBuffers(ring)) if ring > 1 else [glGenBuffers(1)]
+        glPixelStorei(GL_PACK_ALIGNMENT, 1)
+        for pbo in self.pbos:
+            glBindBuffer(GL_PIXEL_PACK_BUFFER, pbo)
+            glBufferData(GL_PIXEL_PACK_BUFFER, self.nbytes, None, GL_STREAM_READ)
+        glBindBuffer(GL_PIXEL_PACK_BUFFER, 0)
+        self.issued = self.taken = 0
+
+    def push(self):
+        """Start reading the current framebuffer; returns the oldest finished frame once the ring is full."""
+        from OpenGL.GL import (GL_PIXEL_PACK_BUFFER, GL_RGB, GL_UNSIGNED_BYTE,
+                               glBindBuffer, glReadPixels)
+        glBindBuffer(GL_PIXEL_PACK_BUFFER, self.pbos[self.issued % self.ring])
+        glReadPixels(0, 0, self.width, self.height, GL_RGB, GL_UNSIGNED_BYTE, ctypes.c_void_p(0))
+        glBindBuffer(GL_PIXEL_PACK_BUFFER, 0)
+        self.issued += 1
+        if self.issued - self.taken >= self.ring:
+            return self._take()
+        return None
+
+    def drain(self):
+        while self.taken < self.issued:
+            yield self._take()
+
+    def _take(self):
+        """Map the oldest outstanding PBO and copy it out: bottom-up rows, like glReadPixels."""
+        import numpy as np
+        from OpenGL.GL import (GL_PIXEL_PACK_BUFFER, GL_READ_ONLY, glBindBuffer,
+                               glMapBuffer, glUnmapBuffer)
+        glBindBuffer(GL_PIXEL_PACK_BUFFER, self.pbos[self.taken % self.ring])
+        ptr = glMapBuffer(GL_PIXEL_PACK_BUFFER, GL_READ_ONLY)
+        frame = np.empty((self.height, self.width, 3), np.uint8)
+        ctypes.memmove(frame.ctypes.data, ptr, self.nbytes)
+        glUnmapBuffer(GL_PIXEL_PACK_BUFFER)
+        glBindBuffer(GL_PIXEL_PACK_BUFFER, 0)
+        self.taken += 1
+        return frame
+
+    def delete(self):
+        from OpenGL.GL import glDeleteBuffers
+        glDeleteBuffers(len(self.pbos), self.pbos)
+        self.pbos = []
+
+
+def encode(frame, path, fmt, level):
+    """Write one bottom-up frame top row first, as PNG or raw RGB bytes."""
+    frame = frame[::-1]
+    if fmt == "png":
+        from PIL import Image
+        Image.fromarray(frame).save(path, compress_level=level)
+    else:
+        with open(path, "wb") as f:
+            f.write(frame.tobytes())
+
+def peak_rss_mb():
+    # ru_maxrss is in kilobytes on Linux.
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024.0
+
+def _setup(opts):
+    """This process's GL context and teapot module, created on first use."""
+    global _context
+    if _context is None:
+        import headless
+        sys.path.insert(0, TEAPOT_DIR)
+        _context = headless.OffscreenContext(*opts["size"], opts["backend"])
+    import teapot
+    teapot.parse_args(opts["teapot_args"])
+    teapot.LOD = "off"
+    return teapot
+
+def export_model(job):
+    """Render, read back and encode one model's turntable; returns its JSON record."""
+    path, out_dir, opts = job
+    rec = {"model": path}
+    try:
+        teapot = _setup(opts)
+        width, height = opts["size"]
+        # No .meshcache.npz next to catalog models: each is loaded once.
+        teapot.load_obj(path, use_cache=False)
+        teapot.compute_normals()
+        teapot.reshape(width, height)
+        teapot.init_lighting()
+        teapot.init_material()
+        teapot.build_mesh()
+        os.makedirs(out_dir, exist_ok=True)
+
+        n, fmt = opts["frames"], opts["format"]
+        names = [os.path.join(out_dir, f"frame_{i:04d}.{'png' if fmt == 'png' else 'rgb'}")
+                 for i in range(n)]
+        slots = threading.BoundedSemaphore(opts["queue"])
+        errors = []
+
+        def submit(pool, frame, i):
+            # Blocks the render loop while --queue frames wait for the encoders.
+            slots.acquire()
+            fut = pool.submit(encode, frame, names[i], fmt, opts["level"])
+            fut.add_done_callback(lambda f: (slots.release(), f.exception() and errors.append(f.exception())))
+
+        start = time.perf_counter()
+        reader = PBOReader(width, height, opts["ring"])
+        done = 0
+        try:
+            with ThreadPoolExecutor(max_workers=opts["encoders"]) as pool:
+                for i in range(n):
+                    teapot.angle = i * 360.0 / n
+                    teapot.render()
+                    frame = reader.push()
+                    if frame is not None:
+                        submit(pool, frame, done)
+                        done += 1
+                for frame in reader.drain():
+                    submit(pool, frame, done)
+                    done += 1
+        finally:
+            # The next model in this process reuses the context; don't leak its buffers.
+            reader.delete()
+        if errors:
+            raise errors[0]
+        elapsed = time.perf_counter() - start
+        rec.update(frames=n, triangles=int(len(teapot.triangles)), seconds=round(elapsed, 3),
+                   fps=round(n / elapsed, 2) if elapsed > 0 else None, out=out_dir)
+    except Exception as e:
+        rec["error"] = f"{type(e).__name__}: {e}"
+    rec["peak_rss_mb"] = round(peak_rss_mb(), 1)
+    return rec
+
+def read_sources(args):
+    sources = list(args.models)
+    for name in args.list or ():
+        with open(name) as f:
+            sources += [line.strip() for line in f if line.strip() and not line.startswith("#")]
+    return sources
+
+def output_dirs(sources, out):
+    """
+    OUT/<path relative to the models' common directory, minus extension>
+    per model, so same-named models in different folders stay apart. Two
+    sources that would share a directory raise ValueError.
+    """
+    paths = [os.path.splitext(os.path.abspath(s))[0] for s in sources]
+    base = os.path.commonpath([os.path.dirname(p) for p in paths])
+    dirs, seen = [], {}
+    for s, p in zip(sources, paths):
+        d = os.path.join(out, os.path.relpath(p, base))
+        if d in seen:
+            raise ValueError(f"{s} and {seen[d]} would both export to {d}")
+        seen[d] = s
+        dirs.append(d)
+    return dirs
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="Export turntable frames for OBJ models.")
+    ap.add_argument("models", nargs="*", help="OBJ paths")
+    ap.add_argument("--list", action="append", help="file with one OBJ path per line")
+    ap.add_argument("--out", default="turntable",
+                    help="frames go to OUT/<model path below the models' common folder>/")
+    ap.add_argument("--frames", type=int, default=72)
+    ap.add_argument("--width", type=int, default=800)
+    ap.add_argument("--height", type=int, default=600)
+    ap.add_argument("--format", choices=("png", "raw"), default="png")
+    ap.add_argument("--level", type=int, default=6, help="PNG compression level")
+    ap.add_argument("--encoders", type=int, default=2, help="encoder threads per process")
+    ap.add_argument("--queue", type=int, default=8, help="frames read back but not yet written")
+    ap.add_argument("--ring", type=int, default=RING, help="pixel buffer objects per reader")
+    ap.add_argument("--procs", type=int, default=1, help="processes, one model at a time each")
+    ap.add_argument("--backend", choices=("egl", "osmesa"), default="egl")
+    args, teapot_args = ap.parse_known_args(argv)
+
+    sources = read_sources(args)
+    if not sources:
+        ap.error("no models given")
+    # PyOpenGL picks its platform on first import, in every worker too.
+    os.environ.setdefault("PYOPENGL_PLATFORM", args.backend)
+    if args.backend == "egl":
+        os.environ.setdefault("EGL_PLATFORM", "surfaceless")
+    sys.path.insert(0, ROOT)
+
+    opts = {"size": (args.width, args.height), "backend": args.backend, "frames": args.frames,
+            "format": args.format, "level": args.level, "encoders": args.encoders,
+            "queue": max(1, args.queue), "ring": max(1, args.ring), "teapot_args": teapot_args}
+    out = os.path.abspath(args.out)
+    try:
+        dirs = output_dirs(sources, out)
+    except ValueError as e:
+        ap.error(str(e))
+    jobs = [(os.path.abspath(s), d, opts) for s, d in zip(sources, dirs)]
+
+    start = time.perf_counter()
+    frames = failed = 0
+    peak = 0.0
+    records = []
+    if args.procs > 1:
+        with Pool(args.procs) as pool:
+            for rec in pool.imap_unordered(export_model, jobs):
+                records.append(rec)
+                print(json.dumps(rec), flush=True)
+    else:
+        for rec in map(export_model, jobs):
+            records.append(rec)
+            print(json.dumps(rec), flush=True)
+    for rec in records:
+        frames += rec.get("frames", 0)
+        failed += "error" in rec
+        peak = max(peak, rec["peak_rss_mb"])
+    elapsed = time.perf_counter() - start
+    fps = frames / elapsed if elapsed > 0 else float("inf")
+    print(f"{len(records)} models ({failed} failed), {frames} frames in {elapsed:.2f} s: "
+          f"{fps:.1f} frames/s with {args.procs} processes, peak RSS {peak:.0f} MB per process",
+          file=sys.stderr)
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())